@@ -0,0 +1,109 @@
+"""批处理模式: 逐行读取场景 CSV, 用与界面相同的引擎计算, 并逐行写出结果。不导入任何界面库。"""
+
+import csv
+import sys
+
+import engine
+from cache import LRUCache
+
+# --- 输入列与取值别名, 方便服务器脚本使用英文 ---
+INPUT_COLUMNS = ["principal", "rate", "frequency", "duration", "unit"]
+# 可选的定投列: 每期金额、周期单位 (缺省为月)、起止日 (天) 与每年递增比例 (%)
+CONTRIBUTION_COLUMNS = ["contribution", "contribution_unit", "contribution_start", "contribution_end", "step_up"]
+# log_final_amount 只在最终金额超出浮点范围 (final_amount 为 inf) 时填写, 为其自然对数
+OUTPUT_COLUMNS = ["final_amount", "total_interest", "return_rate", "total_invested", "log_final_amount", "error"]
+FREQUENCY_ALIASES = {"daily": "按日", "monthly": "按月", "yearly": "按年", "annual": "按年"}
+UNIT_ALIASES = {"year": "年", "years": "年", "month": "月", "months": "月",
+                "week": "周", "weeks": "周", "day": "日", "days": "日"}
+DEFAULT_CACHE_MB = 64
+
+
+def parse_row(row):
+    # 把一行 CSV 转换为 ProjectionInput; 缺少列或数值非法时抛出 ValueError
+    missing = [column for column in INPUT_COLUMNS if not (row.get(column) or "").strip()]
+    if missing:
+        raise engine.InputError(f"缺少列或值为空: {', '.join(missing)}")
+    frequency = row["frequency"].strip()
+    unit = row["unit"].strip()
+    optional = {column: (row.get(column) or "").strip() for column in CONTRIBUTION_COLUMNS}
+    contribution_unit = optional["contribution_unit"] or "月"
+    return engine.make_input(
+        row["principal"],
+        row["rate"],
+        FREQUENCY_ALIASES.get(frequency.lower(), frequency),
+        row["duration"],
+        UNIT_ALIASES.get(unit.lower(), unit),
+        contribution_amount=optional["contribution"] or 0,
+        contribution_unit=UNIT_ALIASES.get(contribution_unit.lower(), contribution_unit),
+        contribution_start_day=optional["contribution_start"] or 0,
+        contribution_end_day=optional["contribution_end"] or None,
+        step_up_percent=optional["step_up"] or 0,
+    )
+
+
+def evaluate_row(row, cache=None):
+    # 返回输出列字典; 单行出错时记录在 error 列, 不中断整个批次
+    # 传入 cache 时, 归一化后相同的场景只计算一次
+    try:
+        inp = parse_row(row)
+        summary = engine.calculate(inp, cache=cache).summary
+    except engine.InputError as e:
+        return {"error": str(e)}
+    except ValueError:
+        return {"error": "请输入有效的数字！"}
+    except ArithmeticError as e:
+        # 单行的计算错误 (如溢出) 只记录在该行, 不中断后续行
+        return {"error": f"计算出错: {e}"}
+    return {
+        "final_amount": repr(summary.final_amount),
+        "total_interest": repr(summary.total_interest),
+        "return_rate": "" if summary.return_rate is None else repr(summary.return_rate),
+        "total_invested": repr(summary.total_invested),
+        "log_final_amount": "" if summary.log_final_amount is None else repr(summary.log_final_amount),
+        "error": "",
+    }
+
+
+def iter_results(rows, cache=None):
+    for row in rows:
+        result = dict(row)
+        result.update(evaluate_row(row, cache))
+        yield result
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def run_batch(in_path, out_path="-", cache_mb=DEFAULT_CACHE_MB):
+    # 流式处理: 除结果缓存外任意时刻只持有一行数据; 返回值用作进程退出码 (有出错行时为 1)
+    # cache_mb 为 0 时不使用缓存
+    failed = 0
+    cache = LRUCache(max_bytes=int(cache_mb * 1024 * 1024)) if cache_mb > 0 else None
+    src = _open(in_path, "r")
+    dst = _open(out_path, "w")
+    try:
+        reader = csv.DictReader(src)
+        extra = [name for name in (reader.fieldnames or []) if name not in OUTPUT_COLUMNS]
+        writer = csv.DictWriter(dst, fieldnames=extra + OUTPUT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for result in iter_results(reader, cache):
+            if result["error"]:
+                failed += 1
+            writer.writerow(result)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+        else:
+            dst.flush()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"结果缓存: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, "
+              f"{stats['entries']} 条 / {stats['bytes'] / 1024:.0f} KiB", file=sys.stderr)
+    if failed:
+        print(f"警告：{failed} 行输入无效, 详见 error 列。", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curves import compute_curves, compute_curves_pickled
+from engine import FREQ_TO_DAYS, make_input
+
+# --- 多场景整条曲线: 工作进程经 pickle 回传数组 vs 直接写入共享内存 (默认 10,000 场景 × 10,000 天) ---
+SCENARIOS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+DAYS = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+# 至少两个工作进程, 单核机器上也走进程间传输
+WORKERS = max(2, os.cpu_count() or 1)
+
+
+def scenarios(count):
+    rng = np.random.default_rng(0)
+    frequencies = list(FREQ_TO_DAYS)
+    return [
+        make_input(rng.uniform(1000, 100000), rng.uniform(0, 10), frequencies[i % len(frequencies)], DAYS - 1, "日")
+        for i in range(count)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    inputs = scenarios(SCENARIOS)
+    days = np.arange(DAYS)
+    print(f"场景数: {SCENARIOS}  天数: {DAYS}  结果大小: {SCENARIOS * DAYS * 8 / 1e6:.0f} MB  工作进程: {WORKERS}")
+    print(f"{'方式':<10} {'耗时 (s)':>10}")
+    pickled_time, pickled = timed(lambda: compute_curves_pickled(inputs, days, workers=WORKERS))
+    print(f"{'pickle':<10} {pickled_time:>10.3f}")
+    checksum = pickled[:, -1].copy()
+    del pickled
+    shared_time, shared = timed(lambda: compute_curves(inputs, days, workers=WORKERS))
+    print(f"{'共享内存':<10} {shared_time:>10.3f}")
+    with shared:
+        assert np.array_equal(checksum, shared.values[:, -1])
+
+
+if __name__ == "__main__":
+    main()
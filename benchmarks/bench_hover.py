@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import chart
+import engine
+
+# --- 模拟大量鼠标移动事件: 对比线性扫描与二分查找, 以及完整的悬停处理耗时 ---
+NUM_EVENTS = 2000
+NUM_CHART_EVENTS = 500
+POINT_COUNTS = [500, 5000, 20000]
+COLORS = {"bg_color": "#f0f0f0", "text_color": "#1c1c1c", "spine_color": "#565b5e", "grid_color": "#d6d6d6", "line_color": "#1f77b4", "annot_bg": "white", "annot_text": "black"}
+
+
+def legacy_nearest(plot_info, xdata):
+    distances = [abs(p['plot_x'] - xdata) for p in plot_info]
+    return distances.index(min(distances))
+
+
+def bench_lookup(num_points, xs):
+    x = np.linspace(0, 100, num_points)
+    plot_info = [{'day': i, 'amount': 0.0, 'plot_x': float(v)} for i, v in enumerate(x)]
+    points = chart.PlotPoints(x, np.arange(num_points), np.zeros(num_points))
+
+    start = time.perf_counter()
+    for xdata in xs:
+        legacy_nearest(plot_info, xdata)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for xdata in xs:
+        points.nearest(xdata)
+    search_time = time.perf_counter() - start
+    return legacy_time, search_time
+
+
+def bench_chart_hover(xs):
+    warnings.filterwarnings("ignore")
+    growth_chart = chart.GrowthChart(FigureCanvasAgg, lambda: COLORS, hover_throttle_ms=0)
+    inp = engine.make_input(1000, 10, "按月", 30, "年")
+    growth_chart.set_projection(engine.run(inp))
+    growth_chart.update_plot("月")
+    # 在坐标轴坐标中放置事件 (横向按 xs 百分比, 纵向居中), 与纵轴是否为对数刻度无关
+    events = []
+    for xdata in xs:
+        x, y = growth_chart.ax.transAxes.transform((xdata / 100, 0.5))
+        events.append(MouseEvent("motion_notify_event", growth_chart.canvas, x, y))
+
+    start = time.perf_counter()
+    for event in events:
+        growth_chart.hover(event)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(0, 100, NUM_EVENTS)
+    print(f"{NUM_EVENTS} 次鼠标事件")
+    print(f"{'点数':>8} {'线性扫描 (ms)':>14} {'二分查找 (ms)':>14}")
+    for num_points in POINT_COUNTS:
+        legacy_time, search_time = bench_lookup(num_points, xs)
+        print(f"{num_points:>8} {legacy_time * 1e3:>14.1f} {search_time * 1e3:>14.1f}")
+
+    total = bench_chart_hover(xs[:NUM_CHART_EVENTS])
+    print(f"完整悬停处理 (Agg, blit, {NUM_CHART_EVENTS} 次): 每次 {total / NUM_CHART_EVENTS * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import math
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import format_log_amount, project
+
+# --- 对比原逐日循环、线性空间向量化与对数空间向量化; 按日复利、较高利率时原循环会溢出 ---
+PRINCIPAL = 1000.0
+CASES = [
+    # (说明, 每期收益率, 每期天数, 年限)
+    ("按年 5%", 0.05, 365.0, 100),
+    ("按月 1%", 0.01, 30.0, 100),
+    ("按日 0.05%", 0.0005, 1.0, 100),
+    ("按日 3%", 0.03, 1.0, 100),
+    ("按日 5%", 0.05, 1.0, 1000),
+]
+
+
+def legacy_loop(principal, rate_per_period, days_per_period, total_days):
+    # 原 calculate() 的写法: Python 浮点幂在溢出时直接抛出 OverflowError
+    plot_data = []
+    for day in range(int(total_days) + 1):
+        current_periods = day / days_per_period
+        amount = principal * ((1 + rate_per_period) ** current_periods)
+        plot_data.append((day, amount))
+    return plot_data
+
+
+def linear_curve(projection, days):
+    return projection.amounts_at(days)
+
+
+def log_curve(projection, days):
+    return projection.log_amounts_at(days)
+
+
+def best_of(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    print(f"{'场景':<12} {'天数':>8} {'循环 (ms)':>12} {'线性 (ms)':>10} {'对数 (ms)':>10}  最终金额")
+    for label, rate, days_per_period, years in CASES:
+        total_days = years * 365
+        projection = project(PRINCIPAL, rate, days_per_period, total_days)
+        days = np.arange(len(projection))
+        try:
+            legacy_loop(PRINCIPAL, rate, days_per_period, total_days)
+            loop_text = f"{best_of(lambda: legacy_loop(PRINCIPAL, rate, days_per_period, total_days), repeat=3) * 1e3:>12.3f}"
+        except OverflowError:
+            loop_text = f"{'溢出':>10}"
+        linear_time = best_of(lambda: linear_curve(projection, days))
+        log_time = best_of(lambda: log_curve(projection, days))
+        final = projection.final_amount
+        final_text = f"{final:.4e}" if math.isfinite(final) else f"inf -> {format_log_amount(projection.log_final_amount)}"
+        print(f"{label:<12} {total_days + 1:>8} {loop_text} {linear_time * 1e3:>10.3f} {log_time * 1e3:>10.3f}  {final_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import project
+
+# --- 对比原 calculate() 中的逐日循环与向量化引擎 ---
+PRINCIPAL = 1000.0
+RATE_PER_PERIOD = 0.10
+DAYS_PER_PERIOD = 365.0
+HORIZON_YEARS = [1, 10, 100, 1000]
+
+
+def legacy_loop(principal, rate_per_period, days_per_period, total_days):
+    plot_data = []
+    for day in range(int(total_days) + 1):
+        current_periods = day / days_per_period
+        amount = principal * ((1 + rate_per_period) ** current_periods)
+        plot_data.append((day, amount))
+    return plot_data
+
+
+def full_curve(principal, rate_per_period, days_per_period, total_days):
+    projection = project(principal, rate_per_period, days_per_period, total_days)
+    return projection.amounts_at(np.arange(len(projection)))
+
+
+def plotted_points(principal, rate_per_period, days_per_period, total_days):
+    # 与图表一致: 最多约 500 个点, 再加上最终金额
+    projection = project(principal, rate_per_period, days_per_period, total_days)
+    step = max(1, len(projection) // 500)
+    return projection.amounts_at(projection.sample_days(step)), projection.final_amount
+
+
+def best_of(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    print(f"{'年限':>6} {'天数':>8} {'循环 (ms)':>12} {'整条曲线 (ms)':>14} {'按需取点 (ms)':>14}")
+    for years in HORIZON_YEARS:
+        total_days = years * 365
+        args = (PRINCIPAL, RATE_PER_PERIOD, DAYS_PER_PERIOD, total_days)
+        loop_time = best_of(lambda: legacy_loop(*args))
+        full_time = best_of(lambda: full_curve(*args))
+        sampled_time = best_of(lambda: plotted_points(*args))
+        print(f"{years:>6} {total_days + 1:>8} {loop_time * 1e3:>12.3f} {full_time * 1e3:>14.3f} {sampled_time * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- 本地服务压测: 启动 script.py --serve, 用若干 keep-alive 连接并发请求, 统计客户端吞吐与延迟 ---
+CONCURRENCY = 64
+REQUESTS = 4000
+FREQUENCIES = ["yearly", "monthly", "daily"]
+
+
+def distinct_scenario(i):
+    return {"principal": 1000 + i, "rate": 1 + i % 97 / 10, "frequency": FREQUENCIES[i % 3],
+            "duration": 1 + i % 50, "unit": "year"}
+
+
+def repeated_scenario(i):
+    # 只有 20 种不同场景, 并发请求大部分可以合并
+    return distinct_scenario(i % 20)
+
+
+def contribution_scenario(i):
+    return dict(distinct_scenario(i), contribution=100, contribution_unit="month", points=100)
+
+
+def batch_body(i):
+    return {"scenarios": [distinct_scenario(i * 100 + k) for k in range(100)]}
+
+
+def sweep_body(i):
+    return {"principals": [1000 + i, 5000, 10000], "rates": list(np.linspace(0, 20, 30)),
+            "frequencies": FREQUENCIES, "durations": list(range(1, 31)), "unit": "year"}
+
+
+PHASES = [
+    # (说明, 接口, 请求体生成函数, 请求数)
+    ("单场景 (各不相同)", "/project", distinct_scenario, REQUESTS),
+    ("单场景 (20 种重复)", "/project", repeated_scenario, REQUESTS),
+    ("单场景 + 定投 + 曲线", "/project", contribution_scenario, REQUESTS // 4),
+    ("批量 (每次 100 个)", "/batch", batch_body, REQUESTS // 40),
+    ("网格扫描 (8,100 格)", "/sweep", sweep_body, REQUESTS // 40),
+]
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def run_phase(port, path, make_body, count):
+    latencies = []
+    errors = 0
+    counter = iter(range(count))
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                status, _ = await request(reader, writer, "POST", path, make_body(i))
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(CONCURRENCY, count))))
+    return time.perf_counter() - start, np.array(latencies) * 1e3, errors
+
+
+async def fetch_metrics(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return (await request(reader, writer, "GET", "/metrics"))[1]
+    finally:
+        writer.close()
+
+
+def start_server():
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "script.py"), "--serve", "--port", "0"],
+                               stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    # "服务已启动: http://127.0.0.1:端口 (...)"
+    return process, int(line.split("127.0.0.1:")[1].split()[0])
+
+
+async def main():
+    process, port = start_server()
+    try:
+        print(f"并发连接: {CONCURRENCY}  端口: {port}")
+        print(f"{'场景':<22} {'请求数':>6} {'错误':>4} {'吞吐 (req/s)':>12} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+        for label, path, make_body, count in PHASES:
+            elapsed, latencies, errors = await run_phase(port, path, make_body, count)
+            p50, p95, p99 = np.percentile(latencies, (50, 95, 99))
+            print(f"{label:<22} {count:>6} {errors:>4} {count / elapsed:>12.1f} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f}")
+        metrics = await fetch_metrics(port)
+        print(f"服务端: 场景 {metrics['scenarios']} 个, 合并 {metrics['coalesced']} 个, "
+              f"进程池批次 {metrics['batches']} 个, 平均每批 {metrics['mean_batch_size']:.1f} 个")
+    finally:
+        # 与 Ctrl+C 相同, 服务会先关闭进程池再退出
+        process.send_signal(signal.SIGINT)
+        process.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- 启动耗时: 基于 -X importtime 统计各模块的累计导入时间, 并在有显示器时测量首帧时间 ---
+TRACKED_MODULES = ["script", "gui", "batch", "engine", "chart", "customtkinter", "matplotlib", "numpy"]
+
+FIRST_PAINT_CODE = """
+import time
+start = time.perf_counter()
+import gui
+app = gui.VisualCompoundInterestCalculator()
+def on_idle():
+    app.update()
+    print(f"first_paint {time.perf_counter() - start:.6f}")
+    app.destroy()
+app.after_idle(on_idle)
+app.mainloop()
+"""
+
+
+def import_times(statement):
+    # 返回 {模块名: 累计导入时间 (微秒)}, 只统计 TRACKED_MODULES 中的顶层模块
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].strip()
+        if name in TRACKED_MODULES:
+            times[name] = cumulative
+    return times
+
+
+def first_paint_time():
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT_CODE],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("first_paint "):
+            return float(line.split()[1])
+    return None
+
+
+def main():
+    for statement in ["import engine", "import batch", "import gui", "import chart"]:
+        times = import_times(statement)
+        print(f"--- {statement} ---")
+        for name in TRACKED_MODULES:
+            if name in times:
+                print(f"  {name:<14} {times[name] / 1000:>9.1f} ms")
+
+    paint = first_paint_time()
+    if paint is None:
+        print("首帧时间: 跳过 (没有可用的显示器)")
+    else:
+        print(f"首帧时间: {paint * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
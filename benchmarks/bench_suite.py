@@ -0,0 +1,207 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import warnings
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import chart
+import engine
+from cache import LRUCache
+
+# --- 回归基准: 计算 (calculate)、绘图 (update_plot, 各图表周期) 与悬停 (hover, 合成鼠标事件),
+#     覆盖 1 天 ~ 1000 年与全部复利频率, 结果以 JSON 输出, 可与之前版本的结果对比 ---
+SCHEMA_VERSION = 1
+PRINCIPAL = 1000.0
+# 每期收益率 (%): 按日复利的长期限会超出浮点范围, 同时覆盖对数刻度的绘图与悬停路径
+RATE_PERCENT = 5.0
+HORIZONS = [
+    # (说明, 时长, 单位)
+    ("1日", 1, "日"),
+    ("1月", 1, "月"),
+    ("1年", 1, "年"),
+    ("10年", 10, "年"),
+    ("100年", 100, "年"),
+    ("1000年", 1000, "年"),
+]
+FREQUENCIES = list(engine.FREQ_TO_DAYS)
+PERIODS = list(chart.PERIOD_MAP)
+COLORS = {"bg_color": "#f0f0f0", "text_color": "#1c1c1c", "spine_color": "#565b5e", "grid_color": "#d6d6d6", "line_color": "#1f77b4", "annot_bg": "white", "annot_text": "black"}
+DEFAULT_REPEATS = 5
+DEFAULT_HOVER_EVENTS = 100
+DEFAULT_THRESHOLD = 1.25
+
+
+def stats(samples):
+    # 单次调用耗时 (秒) 的统计量
+    return {
+        "samples": len(samples),
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "p95_s": float(np.percentile(samples, 95)),
+    }
+
+
+def measure(func, repeat, number=None):
+    # number 缺省时用 autorange 选取每轮调用次数, 适合微秒级的函数; 较慢的绘图每轮只调用一次
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return stats([t / number for t in timer.repeat(repeat=repeat, number=number)])
+
+
+def bench_calculate(inp, repeat):
+    cache = LRUCache()
+    engine.calculate(inp, cache=cache)
+    return {
+        "calculate": measure(lambda: engine.calculate(inp), repeat),
+        "calculate_cached": measure(lambda: engine.calculate(inp, cache=cache), repeat),
+    }
+
+
+def hover_events(growth_chart, count):
+    # 在曲线横轴范围内均匀分布的合成 motion_notify_event, 纵坐标取坐标轴中部
+    x_min, x_max = growth_chart.ax.get_xlim()
+    y_mid = sum(growth_chart.ax.get_ylim()) / 2
+    events = []
+    for x in np.linspace(x_min, x_max, count):
+        px, py = growth_chart.ax.transData.transform((x, y_mid))
+        events.append(MouseEvent("motion_notify_event", growth_chart.canvas, px, py))
+    return events
+
+
+def bench_chart(growth_chart, projection, period, repeat, hover_count):
+    growth_chart.set_projection(projection)
+
+    def cold():
+        # 清空曲线缓存: 包含采样、对数计算与降采样
+        growth_chart._curve_cache.clear()
+        growth_chart.update_plot(period)
+
+    results = {
+        "update_plot_cold": measure(cold, repeat, number=1),
+        "update_plot": measure(lambda: growth_chart.update_plot(period), repeat, number=1),
+    }
+    # 经由画布的事件分发调用 hover(), 与界面中的鼠标移动相同; 节流为 0, 每个事件都完整处理
+    samples = []
+    for event in hover_events(growth_chart, hover_count):
+        start = time.perf_counter()
+        growth_chart.canvas.callbacks.process("motion_notify_event", event)
+        samples.append(time.perf_counter() - start)
+    results["hover"] = stats(samples)
+    results["hover"]["log_scale"] = growth_chart.log_scale
+    return results
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def metadata():
+    return {
+        "schema": SCHEMA_VERSION,
+        "timestamp": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "principal": PRINCIPAL,
+        "rate_percent": RATE_PERCENT,
+    }
+
+
+def run_suite(repeat, hover_count, progress=None):
+    warnings.filterwarnings("ignore")
+    growth_chart = chart.GrowthChart(FigureCanvasAgg, lambda: COLORS, hover_throttle_ms=0)
+    results = []
+    for frequency in FREQUENCIES:
+        for label, value, unit in HORIZONS:
+            inp = engine.make_input(PRINCIPAL, RATE_PERCENT, frequency, value, unit)
+            case = {"frequency": frequency, "horizon": label, "horizon_days": int(inp.total_days)}
+            for name, result in bench_calculate(inp, repeat).items():
+                results.append(dict(case, benchmark=name, period=None, **result))
+            projection = engine.run(inp)
+            for period in PERIODS:
+                for name, result in bench_chart(growth_chart, projection, period, repeat, hover_count).items():
+                    results.append(dict(case, benchmark=name, period=period, **result))
+            if progress is not None:
+                progress(f"{frequency} {label}")
+    return {"meta": metadata(), "results": results}
+
+
+def result_key(result):
+    return (result["benchmark"], result["frequency"], result["horizon"], result["period"])
+
+
+def compare(baseline, current, threshold):
+    # 按中位数对比, 返回变慢超过 threshold 倍的条目数; 只把变慢或变快超过 threshold 倍的条目打印到标准错误
+    previous = {result_key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"对比基线 {baseline['meta'].get('revision')} ({baseline['meta'].get('timestamp')})", file=sys.stderr)
+    print(f"{'基准':<18} {'频率':<4} {'时长':<6} {'周期':<4} {'基线 (ms)':>10} {'当前 (ms)':>10} {'比值':>7}", file=sys.stderr)
+    for result in current["results"]:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result["median_s"] / old["median_s"] if old["median_s"] > 0 else float("inf")
+        if ratio > threshold:
+            regressions += 1
+            flag = "  <- 变慢"
+        elif ratio < 1 / threshold:
+            flag = "  <- 变快"
+        else:
+            continue
+        print(f"{result['benchmark']:<18} {result['frequency']:<4} {result['horizon']:<6} {result['period'] or '-':<4} "
+              f"{old['median_s'] * 1e3:>10.3f} {result['median_s'] * 1e3:>10.3f} {ratio:>7.2f}{flag}", file=sys.stderr)
+    print(f"共 {regressions} 项变慢超过 {threshold:g} 倍", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="计算、绘图与悬停热点路径的基准测试, 结果输出为 JSON")
+    parser.add_argument("--out", metavar="JSON", default="-", help="结果输出路径, 默认为标准输出")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="每项计时的重复轮数")
+    parser.add_argument("--hover-events", type=int, default=DEFAULT_HOVER_EVENTS, help="每个图表周期的合成鼠标事件数")
+    parser.add_argument("--compare", metavar="JSON", help="与之前保存的结果对比, 有变慢的条目时退出码为 1")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="判定变慢的中位数比值, 默认为 1.25")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.repeats, args.hover_events,
+                       progress=lambda text: print(f"完成: {text}", file=sys.stderr, flush=True))
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            return 1 if compare(json.load(f), report, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import sweep
+
+# --- 参数扫描: 逐个调用引擎 vs 向量化 (结果在内存中) vs 多进程分块写入内存映射文件 ---
+FREQUENCIES = list(engine.FREQ_TO_DAYS)
+LOOP_SAMPLE = 20000
+
+
+def grid(size):
+    # 构造约 size 个组合的网格: 本金 10 × 频率 3 × 利率 n × 时长 n
+    n = max(1, int(round((size / 30) ** 0.5)))
+    return (sweep.grid_range(1000, 10000, 10), sweep.grid_range(0, 20, n), FREQUENCIES, sweep.grid_range(1, 50, n))
+
+
+def python_loop(principals, rates, frequencies, durations, limit):
+    count = 0
+    for principal in principals:
+        for rate in rates:
+            for frequency in frequencies:
+                for duration in durations:
+                    inp = engine.make_input(principal, rate, frequency, duration, "年")
+                    engine.summarize(engine.run(inp))
+                    count += 1
+                    if count >= limit:
+                        return count
+    return count
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"CPU 核数: {os.cpu_count()}")
+    print(f"{'组合数':>10} {'逐个调用 (s, 估算)':>18} {'向量化 (s)':>12} {'映射文件 (s)':>12}")
+    for size in [10**5, 10**6, 10**7]:
+        axes = grid(size)
+        loop_time, count = timed(lambda: python_loop(*axes, LOOP_SAMPLE))
+        single_time, result = timed(lambda: sweep.sweep(*axes))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.bin")
+            store_time, stored = timed(lambda: sweep.sweep(*axes, out=path))
+            assert np.array_equal(result.values, stored.values, equal_nan=True)
+            del stored
+        total = int(np.prod(result.shape))
+        print(f"{total:>10} {loop_time / count * total:>18.2f} {single_time:>12.3f} {store_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
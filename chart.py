@@ -0,0 +1,609 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# --- 图表库导入 (由界面在首次需要时再导入本模块) ---
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.ticker import AutoLocator, FuncFormatter, MaxNLocator
+
+import downsample
+import engine
+import fonts
+
+PERIOD_MAP = {"日": 1, "周": 7, "月": 30, "年": 365}
+HOVER_THROTTLE_MS = 16
+MIN_PLOT_POINTS = 100
+CURVE_CACHE_SIZE = 64
+PINNED_COLORS = ["#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2"]
+# 曲线最大值达到该值或超出浮点范围时, 纵轴改为按常用对数绘制
+LOG_SCALE_THRESHOLD = 1e15
+LN10 = np.log(10.0)
+
+
+# --- 解决Matplotlib中文和符号显示问题的函数 ---
+def set_matplotlib_font():
+    try:
+        family, elapsed = fonts.resolve_cjk_font()
+        # 已解析出可用字体时只设置这一项, 避免 matplotlib 逐个查找候选字体
+        font_list = [family] if family is not None else fonts.CJK_FONT_CANDIDATES
+        matplotlib.rcParams['font.sans-serif'] = font_list
+        matplotlib.rcParams['font.family'] = 'sans-serif'
+        matplotlib.rcParams['axes.unicode_minus'] = False
+        print(f"Matplotlib 中文字体设置成功: {family or '未找到, 使用候选列表'} (耗时 {elapsed * 1000:.1f} ms)。")
+    except Exception as e:
+        print(f"未能成功设置Matplotlib中文字体: {e}")
+
+
+def format_amount_tick(y, pos):
+    return f'{y:,.2f}' if y < 1e6 else f'{y:.2e}'
+
+
+def format_log10_tick(v, pos):
+    # 对数纵轴/色阶的刻度: v 为金额的常用对数, 数值很大时直接写成 1e<v>, 避免 10 ** v 溢出
+    return format_amount_tick(10.0 ** v, pos) if v < 15 else f'1e{v:.0f}'
+
+
+def format_money(value, log_value=None):
+    # 金额超出浮点范围时改用对数给出的科学计数法; NaN (无从得知) 显示为 N/A
+    if np.isnan(value):
+        return "N/A"
+    if np.isfinite(value) or log_value is None:
+        return f"¥{engine.format_number(value)}"
+    return f"¥{engine.format_log_amount(log_value)}"
+
+
+class PlotPoints:
+    # 图上各点的平行数组: x 严格递增, 悬停时二分查找最近点, 提示框数据直接按下标读取
+    __slots__ = ("x", "days", "amounts", "profits", "rates", "invested", "log_amounts")
+
+    def __init__(self, x, days, amounts, invested=None, log_amounts=None):
+        # invested 为各点的累计投入 (本金 + 定投), 可为标量或与 amounts 等长的数组
+        # log_amounts 为金额的自然对数, 只在对数纵轴模式下提供, 用于溢出点的显示
+        self.x = np.asarray(x, dtype=np.float64)
+        self.days = np.asarray(days)
+        self.amounts = np.asarray(amounts, dtype=np.float64)
+        self.log_amounts = log_amounts
+        self.profits = None
+        self.rates = None
+        self.invested = None
+        if invested is not None:
+            self.invested = np.broadcast_to(np.asarray(invested, dtype=np.float64), self.amounts.shape)
+            invested = self.invested
+            self.profits = self.amounts - invested
+            if (invested > 0).any():
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    self.rates = np.where(invested > 0, self.profits / invested * 100, np.nan)
+
+    def __len__(self):
+        return len(self.x)
+
+    def nearest(self, x):
+        # 与 x 距离最近的点的下标, 距离相等时取靠前的点
+        i = int(np.searchsorted(self.x, x))
+        if i <= 0:
+            return 0
+        if i >= len(self.x):
+            return len(self.x) - 1
+        return i if self.x[i] - x < x - self.x[i - 1] else i - 1
+
+
+class GrowthChart:
+    # 收益增长曲线: 持有 Figure/Axes/画布, 负责绘制与悬停提示
+    # canvas_factory 接收 Figure 返回画布 (Tk 界面用 FigureCanvasTkAgg, 无界面时可用 Agg)
+    # colors_provider 返回当前主题的配色字典
+    def __init__(self, canvas_factory, colors_provider, figsize=(6, 4), dpi=100,
+                 hover_throttle_ms=HOVER_THROTTLE_MS, show_crosshair=True,
+                 downsample_method="lttb"):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = canvas_factory(self.fig)
+        self.get_colors = colors_provider
+        self.projection = None
+        self.period = "月"
+        self.current_plot_info = None
+        self.show_crosshair = show_crosshair
+        self.downsample_method = downsample_method
+        self._create_overlay()
+
+        # 持久化的曲线与刻度格式化器, update_plot() 只更新数据
+        # mode 为当前坐标轴内容: "placeholder" / "curve" / "heatmap"
+        self.mode = "placeholder"
+        self.line = None
+        self.image = None
+        self.colorbar = None
+        self.heatmap = None
+
+        # --- 多方案叠加: 固定的方案各画一条线, 采样后的单位本金曲线按参数缓存 ---
+        self.pinned = []
+        self._pinned_lines = []
+        self._pinned_stack = None
+        self._curve_cache = OrderedDict()
+
+        # --- 蒙特卡洛分位数带: 中位数为持久化的线, 分位数带每次更新时重建 ---
+        self.simulation = None
+        self.median_line = None
+        self._band_artists = []
+        self._theme = None
+        self._layout_key = None
+        self._y_formatter = FuncFormatter(format_amount_tick)
+        self._log10_formatter = FuncFormatter(format_log10_tick)
+        self.log_scale = False
+
+        # --- 悬停提示使用 blit: 完整重绘后缓存静态背景, 鼠标移动时只重画提示框/标记 ---
+        self.hover_throttle_ms = hover_throttle_ms
+        self._background = None
+        self._pending_event = None
+        self._hover_timer = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("motion_notify_event", self.hover)
+
+    def _create_overlay(self):
+        # 提示框、标记点和十字线都是 animated 艺术家, 不参与完整重绘, 只在 blit 时绘制
+        self.annot = self.ax.annotate("", xy=(0,0), xytext=(20,20), textcoords="offset points", bbox=dict(boxstyle="round", fc="w", ec="k", lw=1), arrowprops=dict(arrowstyle="->"), animated=True)
+        self.annot.set_visible(False)
+        self.marker, = self.ax.plot([], [], marker='o', markersize=6, linestyle='none', animated=True)
+        self.marker.set_visible(False)
+        self.crosshair = self.ax.axvline(0, linestyle=':', linewidth=1, animated=True)
+        self.crosshair.set_visible(False)
+
+    def _overlay_artists(self):
+        artists = [self.marker, self.annot]
+        if self.show_crosshair:
+            artists.insert(0, self.crosshair)
+        return artists
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_overlay()
+
+    def _draw_overlay(self):
+        for artist in self._overlay_artists():
+            if artist.get_visible():
+                self.fig.draw_artist(artist)
+
+    def _blit_overlay(self):
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_overlay()
+        self.canvas.blit(self.fig.bbox)
+
+    def _hide_overlay(self):
+        if self.annot.get_visible():
+            for artist in self._overlay_artists():
+                artist.set_visible(False)
+            self._blit_overlay()
+
+    def hover(self, event):
+        # 节流: 一段时间内的多个鼠标事件合并, 只处理最后一个
+        self._pending_event = event
+        if self.hover_throttle_ms <= 0:
+            self._process_hover()
+            return
+        if self._hover_timer is None:
+            self._hover_timer = self.canvas.new_timer(interval=self.hover_throttle_ms)
+            self._hover_timer.single_shot = True
+            self._hover_timer.add_callback(self._process_hover)
+            self._hover_timer.start()
+
+    def _process_hover(self):
+        self._hover_timer = None
+        event, self._pending_event = self._pending_event, None
+        if event is None:
+            return
+        self._update_hover(event)
+
+    def _update_hover(self, event):
+        if self.mode == "heatmap":
+            self._update_heatmap_hover(event)
+            return
+        points = self.current_plot_info
+        if points is None or not event.inaxes == self.ax:
+            self._hide_overlay()
+            return
+
+        idx = points.nearest(event.xdata)
+        day = points.days[idx]
+        amount = points.amounts[idx]
+        log_amount = None if points.log_amounts is None else points.log_amounts[idx]
+        plot_x = points.x[idx]
+        plot_y = log_amount / LN10 if self.log_scale else amount
+
+        self._place_annotation(plot_x)
+        self.annot.xy = (plot_x, plot_y)
+
+        period = self.period
+        time_value = day / PERIOD_MAP[period]
+
+        if points.profits is not None:
+            profit = points.profits[idx]
+
+            if points.rates is not None and not np.isnan(points.rates[idx]):
+                rate = points.rates[idx]
+                if np.isfinite(rate) or log_amount is None:
+                    rate_text = f"收益率: {engine.format_number(rate)} %"
+                else:
+                    # 溢出时累计投入可以忽略: 收益率 ≈ 金额 / 累计投入 * 100
+                    log_rate = log_amount - np.log(points.invested[idx]) + np.log(100.0)
+                    rate_text = f"收益率: {engine.format_log_amount(log_rate)} %"
+            else:
+                rate_text = "收益率: N/A"
+
+            text = (f"时间: {time_value:.1f} {period}\n"
+                    f"本息合计: {format_money(amount, log_amount)}\n"
+                    f"总收益: {format_money(profit, log_amount)}\n"
+                    f"{rate_text}")
+        else:
+            text = f"{time_value:.1f} {period}\n{format_money(amount, log_amount)}"
+
+        # 所有固定方案在同一时间点的金额: 一次广播求出
+        marker_y = [plot_y]
+        if self._pinned_stack is not None:
+            # 悬停位置超出某个方案的期限时该方案为 N/A, 不画标记点
+            pinned_amounts = self._pinned_stack.amounts_at(day)
+            in_range = day <= self._pinned_stack.last_days
+            pinned_logs = [None] * len(pinned_amounts)
+            if self.log_scale:
+                pinned_logs = self._pinned_stack.log_amounts_at(day)
+                marker_y.extend((pinned_logs / LN10)[in_range])
+            else:
+                marker_y.extend(pinned_amounts[in_range])
+            text += "".join(f"\n{label}: {format_money(value, log_value) if inside else 'N/A'}"
+                            for (label, _), value, log_value, inside
+                            in zip(self.pinned, pinned_amounts, pinned_logs, in_range))
+
+        # 模拟分位数: 按天数在时间点之间插值
+        simulation = self.simulation
+        if simulation is not None:
+            values = simulation.bands_at(day)
+            percentiles = simulation.percentiles
+            if 50 in percentiles:
+                text += f"\n模拟中位数: {format_money(values[percentiles.index(50)])}"
+            text += (f"\n模拟 P{percentiles[0]:g}–P{percentiles[-1]:g}: "
+                     f"{format_money(values[0])} – {format_money(values[-1])}")
+
+        self.annot.set_text(text)
+        colors = self.get_colors()
+        self._style_annotation(colors)
+        self.annot.set_visible(True)
+
+        self.marker.set_data([plot_x] * len(marker_y), marker_y)
+        self.marker.set_color(colors["line_color"])
+        self.marker.set_visible(True)
+        self.crosshair.set_xdata([plot_x, plot_x])
+        self.crosshair.set_color(colors["spine_color"])
+        self.crosshair.set_visible(self.show_crosshair)
+        self._blit_overlay()
+
+    def _place_annotation(self, x):
+        xlim = self.ax.get_xlim()
+        if x > (xlim[0] + xlim[1]) / 2:
+            self.annot.xyann = (-25, 25)
+            self.annot.set_horizontalalignment('right')
+        else:
+            self.annot.xyann = (25, 25)
+            self.annot.set_horizontalalignment('left')
+
+    def _style_annotation(self, colors):
+        self.annot.get_bbox_patch().set_facecolor(colors["annot_bg"])
+        self.annot.get_bbox_patch().set_edgecolor(colors["spine_color"])
+        self.annot.set_color(colors["annot_text"])
+
+    def _update_heatmap_hover(self, event):
+        grid = self.heatmap
+        if grid is None or not event.inaxes == self.ax:
+            self._hide_overlay()
+            return
+
+        # 网格等距, 直接按坐标换算格子下标
+        unit = PERIOD_MAP[self.period]
+        rate_step = grid.rates[1] - grid.rates[0]
+        day_step = grid.days[1] - grid.days[0]
+        col = int(np.clip(round((event.xdata - grid.rates[0]) / rate_step), 0, len(grid.rates) - 1))
+        row = int(np.clip(round((event.ydata * unit - grid.days[0]) / day_step), 0, len(grid.days) - 1))
+        amount, profit, rate_at_point = grid.values[row, col]
+        log_amount = None if grid.log_final_amount is None else grid.log_final_amount[row, col]
+        rate = grid.rates[col]
+        time_value = grid.days[row] / unit
+
+        if np.isnan(rate_at_point):
+            rate_text = "收益率: N/A"
+        elif np.isfinite(rate_at_point) or log_amount is None:
+            rate_text = f"收益率: {engine.format_number(rate_at_point)} %"
+        else:
+            log_rate = log_amount - np.log(grid.invested[row]) + np.log(100.0)
+            rate_text = f"收益率: {engine.format_log_amount(log_rate)} %"
+        text = (f"利率: {rate:.2f} %\n"
+                f"时间: {time_value:.1f} {self.period}\n"
+                f"本息合计: {format_money(amount, log_amount)}\n"
+                f"总收益: {format_money(profit, log_amount)}\n"
+                f"{rate_text}")
+
+        self._place_annotation(rate)
+        self.annot.xy = (rate, time_value)
+        self.annot.set_text(text)
+        colors = self.get_colors()
+        self._style_annotation(colors)
+        self.annot.set_visible(True)
+        self.marker.set_data([rate], [time_value])
+        self.marker.set_color(colors["annot_bg"])
+        self.marker.set_visible(True)
+        self._blit_overlay()
+
+    def _remove_colorbar(self):
+        if self.colorbar is not None:
+            self.colorbar.remove()
+            self.colorbar = None
+            self.image = None
+
+    def setup_initial_plot(self):
+        colors = self.get_colors()
+        self._remove_colorbar()
+        self.ax.clear()
+        self.fig.patch.set_facecolor(colors["bg_color"])
+        self.ax.set_facecolor(colors["bg_color"])
+        self.ax.spines['top'].set_visible(False)
+        self.ax.spines['right'].set_visible(False)
+        self.ax.tick_params(colors=colors["text_color"])
+        self.ax.spines['bottom'].set_color(colors["spine_color"])
+        self.ax.spines['left'].set_color(colors["spine_color"])
+        self.ax.set_title("收益增长曲线", color=colors["text_color"])
+        self.ax.set_xlabel("时间", color=colors["text_color"])
+        self.ax.set_ylabel("本息总额", color=colors["text_color"])
+        self.ax.text(0.5, 0.5, '点击"计算"按钮生成图表', horizontalalignment='center', verticalalignment='center', transform=self.ax.transAxes, color=colors["text_color"], fontsize=14)
+        self._create_overlay()
+        self.mode = "placeholder"
+        self.line = None
+        self._theme = None
+        self.fig.tight_layout()
+        self.canvas.draw()
+
+    def set_projection(self, projection):
+        self.projection = projection
+
+    def set_simulation(self, simulation):
+        # simulation 为 montecarlo.MonteCarloResult, 传入 None 表示只画确定性曲线
+        self.simulation = simulation
+
+    def pin_current(self, label):
+        # 把当前曲线固定为一个叠加方案; 没有可固定的曲线时返回 False
+        if self.projection is None:
+            return False
+        self.pinned.append((label, self.projection))
+        self._pinned_stack = engine.ProjectionStack([p for _, p in self.pinned])
+        return True
+
+    def clear_pinned(self):
+        self.pinned = []
+        self._pinned_stack = None
+
+    def _curve(self, projection, period, target):
+        # 返回 (days, x, y, log_y); 缓存尺度为 1 的曲线, 按 (unit_key, 周期, 目标点数) 复用,
+        # 只改变本金或切换周期时不重复计算, 取出后乘以尺度即可 (降采样对正比例缩放不变)
+        # log_y 为金额的自然对数, 在对数空间计算, 金额溢出为 inf 时仍然有限
+        key = (projection.unit_key, period, target, self.downsample_method)
+        cached = self._curve_cache.get(key)
+        if cached is not None:
+            self._curve_cache.move_to_end(key)
+        else:
+            unit = projection.unit()
+            step = PERIOD_MAP.get(period, 30)
+            days = unit.sample_days(step)
+            x_data = days / PERIOD_MAP[period]
+            y_data = unit.amounts_at(days)
+            log_data = unit.log_amounts_at(days)
+
+            # 点数超过画布像素宽度时降采样, 保留首尾点和曲线形状; 有溢出时按对数曲线挑点
+            if len(days) > target:
+                shape = y_data if np.isfinite(y_data).all() else log_data
+                indices = downsample.downsample_indices(x_data, shape, target, self.downsample_method)
+                days, x_data, y_data, log_data = days[indices], x_data[indices], y_data[indices], log_data[indices]
+
+            cached = (days, x_data, y_data, log_data)
+            self._curve_cache[key] = cached
+            if len(self._curve_cache) > CURVE_CACHE_SIZE:
+                self._curve_cache.popitem(last=False)
+
+        days, x_data, unit_y, unit_log = cached
+        scale = projection.scale
+        if scale == 0:
+            # 曲线恒为 0: 不能用 0 * 单位曲线 (可能为 inf) 求得
+            return days, x_data, np.zeros_like(unit_y), np.full_like(unit_log, -np.inf)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            return days, x_data, scale * unit_y, unit_log + np.log(scale)
+
+    def update_plot(self, period=None):
+        if period is not None:
+            self.period = period
+        if self.projection is None:
+            self.setup_initial_plot()
+            return
+
+        period = self.period
+        target = self._target_points()
+        days, x_data, y_data, log_data = self._curve(self.projection, period, target)
+        pinned_curves = [self._curve(projection, period, target) for _, projection in self.pinned]
+
+        # 任一曲线 (含模拟的最高分位数) 溢出或数值过大时按常用对数绘制, 刻度仍标注为金额
+        maxima = [np.max(curve[2]) for curve in [(days, x_data, y_data, log_data)] + pinned_curves]
+        if self.simulation is not None:
+            maxima.append(np.max(self.simulation.bands[-1]))
+        log_scale = any(not np.isfinite(value) or value >= LOG_SCALE_THRESHOLD for value in maxima)
+        self.current_plot_info = PlotPoints(x_data, days, y_data, self.projection.invested_at(days),
+                                            log_data if log_scale else None)
+
+        # 只更新曲线数据; 仅在首次绘制或主题变化时重建坐标轴
+        colors = self.get_colors()
+        if self.mode != "curve" or colors != self._theme:
+            self._build_axes(colors)
+        if log_scale != self.log_scale:
+            self._set_log_scale(log_scale, colors)
+        for artist in self._overlay_artists():
+            artist.set_visible(False)
+        plot_y = log_data / LN10 if log_scale else y_data
+        self.line.set_data(x_data, plot_y)
+        y_max = np.nanmax(plot_y)
+        self._sync_pinned_lines()
+        for line, (_, pinned_x, pinned_y, pinned_log) in zip(self._pinned_lines, pinned_curves):
+            pinned_plot_y = pinned_log / LN10 if log_scale else pinned_y
+            line.set_data(pinned_x, pinned_plot_y)
+            y_max = max(y_max, np.nanmax(pinned_plot_y))
+        y_max = max(y_max, self._sync_simulation(log_scale, colors))
+        self._update_legend(colors)
+        self.ax.set_xlabel(f"时间 ({period})", color=colors["text_color"])
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
+
+        # 纵轴刻度文字宽度变化时才重新计算布局
+        tick_format = format_log10_tick if log_scale else format_amount_tick
+        layout_key = (log_scale, len(tick_format(float(y_max), None)))
+        if layout_key != self._layout_key:
+            self.fig.tight_layout()
+            self._layout_key = layout_key
+        self.canvas.draw()
+
+    def _set_log_scale(self, log_scale, colors):
+        # 对数模式下曲线数据为金额的常用对数, 整数刻度对应 10 的整数次幂
+        self.log_scale = log_scale
+        if log_scale:
+            self.ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+            self.ax.yaxis.set_major_formatter(self._log10_formatter)
+            self.ax.set_ylabel("本息总额 (元, 对数刻度)", color=colors["text_color"])
+        else:
+            self.ax.yaxis.set_major_locator(AutoLocator())
+            self.ax.yaxis.set_major_formatter(self._y_formatter)
+            self.ax.set_ylabel("本息总额 (元)", color=colors["text_color"])
+
+    def _sync_pinned_lines(self):
+        # 固定方案增减时才创建或移除线条, 其余情况复用
+        while len(self._pinned_lines) > len(self.pinned):
+            self._pinned_lines.pop().remove()
+        while len(self._pinned_lines) < len(self.pinned):
+            color = PINNED_COLORS[len(self._pinned_lines) % len(PINNED_COLORS)]
+            line, = self.ax.plot([], [], linestyle='--', linewidth=1.2, color=color)
+            self._pinned_lines.append(line)
+        for line, (label, _) in zip(self._pinned_lines, self.pinned):
+            line.set_label(label)
+
+    def _sync_simulation(self, log_scale, colors):
+        # 重建分位数带 (成对取最外侧与内侧分位数), 更新中位数线; 返回绘制数据的最大值
+        for artist in self._band_artists:
+            artist.remove()
+        self._band_artists = []
+        simulation = self.simulation
+        if simulation is None:
+            self.median_line.set_visible(False)
+            return -np.inf
+        x_data = simulation.days / PERIOD_MAP[self.period]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bands = np.log10(simulation.bands) if log_scale else simulation.bands
+        percentiles = simulation.percentiles
+        for i in range(len(percentiles) // 2):
+            artist = self.ax.fill_between(x_data, bands[i], bands[-1 - i], color=colors["line_color"],
+                                          alpha=0.12 * (i + 1), linewidth=0,
+                                          label=f"模拟 {percentiles[i]:g}%–{percentiles[-1 - i]:g}%")
+            self._band_artists.append(artist)
+        self.median_line.set_data(x_data, bands[percentiles.index(50)] if 50 in percentiles else [])
+        self.median_line.set_visible(50 in percentiles)
+        return np.nanmax(bands[-1])
+
+    def _update_legend(self, colors):
+        legend = self.ax.get_legend()
+        if not self.pinned and self.simulation is None:
+            if legend is not None:
+                legend.remove()
+            return
+        handles = [self.line] + self._pinned_lines
+        if self.simulation is not None:
+            handles += [self.median_line] + self._band_artists
+        legend = self.ax.legend(handles=handles, loc="upper left", fontsize=9, frameon=True)
+        legend.get_frame().set_facecolor(colors["bg_color"])
+        legend.get_frame().set_edgecolor(colors["spine_color"])
+        for text in legend.get_texts():
+            text.set_color(colors["text_color"])
+
+    def _target_points(self):
+        width = self.ax.get_window_extent().width
+        return max(MIN_PLOT_POINTS, int(width))
+
+    def _build_axes(self, colors):
+        self._remove_colorbar()
+        self.ax.clear()
+        self.fig.patch.set_facecolor(colors["bg_color"])
+        self.ax.set_facecolor(colors["bg_color"])
+        self._pinned_lines = []
+        self._band_artists = []
+        self.line, = self.ax.plot([], [], marker='.', linestyle='-', color=colors["line_color"], markersize=3, label="当前方案")
+        self.median_line, = self.ax.plot([], [], linestyle='-.', linewidth=1.5, color=colors["text_color"], label="模拟中位数")
+        self.median_line.set_visible(False)
+        self.ax.set_title("收益增长曲线", color=colors["text_color"])
+        self.ax.set_ylabel("本息总额 (元)", color=colors["text_color"])
+        self.ax.yaxis.set_major_formatter(self._y_formatter)
+        self.ax.grid(True, linestyle='--', alpha=0.3, color=colors["grid_color"])
+        self.ax.tick_params(axis='x', colors=colors["text_color"])
+        self.ax.tick_params(axis='y', colors=colors["text_color"])
+        for spine in self.ax.spines.values():
+            spine.set_edgecolor(colors["spine_color"])
+        self._create_overlay()
+        self.mode = "curve"
+        self.log_scale = False
+        self._theme = colors
+        self._layout_key = None
+
+    def update_heatmap(self, grid, period=None):
+        # 利率 × 时长 敏感性热力图: 单个 imshow 艺术家, 颜色按本息总额的对数取值
+        if period is not None:
+            self.period = period
+        self.heatmap = grid
+        unit = PERIOD_MAP[self.period]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.log10(np.where(grid.values[..., 0] > 0, grid.values[..., 0], np.nan))
+            if grid.log_final_amount is not None:
+                # 溢出的格子改用对数空间的结果
+                z = np.where(np.isinf(z), grid.log_final_amount / LN10, z)
+        rate_half = (grid.rates[1] - grid.rates[0]) / 2
+        day_half = (grid.days[1] - grid.days[0]) / 2
+        extent = (grid.rates[0] - rate_half, grid.rates[-1] + rate_half,
+                  (grid.days[0] - day_half) / unit, (grid.days[-1] + day_half) / unit)
+
+        colors = self.get_colors()
+        if self.mode != "heatmap" or colors != self._theme:
+            self._build_heatmap_axes(colors, z, extent)
+        else:
+            self.image.set_data(z)
+            self.image.set_extent(extent)
+        finite = z[np.isfinite(z)]
+        if finite.size:
+            low, high = float(finite.min()), float(finite.max())
+            self.image.set_clim(low, high if high > low else low + 1)
+        self.ax.set_xlim(extent[0], extent[1])
+        self.ax.set_ylim(extent[2], extent[3])
+        self.ax.set_ylabel(f"时间 ({self.period})", color=colors["text_color"])
+        for artist in self._overlay_artists():
+            artist.set_visible(False)
+        self.canvas.draw()
+
+    def _build_heatmap_axes(self, colors, z, extent):
+        self._remove_colorbar()
+        self.ax.clear()
+        self.fig.patch.set_facecolor(colors["bg_color"])
+        self.ax.set_facecolor(colors["bg_color"])
+        self.image = self.ax.imshow(z, origin="lower", extent=extent, aspect="auto", interpolation="nearest", cmap="viridis")
+        self.colorbar = self.fig.colorbar(self.image, ax=self.ax)
+        self.colorbar.ax.yaxis.set_major_formatter(FuncFormatter(format_log10_tick))
+        self.colorbar.ax.tick_params(colors=colors["text_color"])
+        self.colorbar.set_label("本息总额 (元, 对数色阶)", color=colors["text_color"])
+        self.ax.set_title("收益敏感性 (利率 × 时长)", color=colors["text_color"])
+        self.ax.set_xlabel("收益率 (%)", color=colors["text_color"])
+        self.ax.tick_params(axis='x', colors=colors["text_color"])
+        self.ax.tick_params(axis='y', colors=colors["text_color"])
+        for spine in self.ax.spines.values():
+            spine.set_edgecolor(colors["spine_color"])
+        self._create_overlay()
+        self.crosshair.set_visible(False)
+        self.mode = "heatmap"
+        self._theme = colors
+        self._layout_key = None
+        self.fig.tight_layout()
@@ -0,0 +1,135 @@
+"""多场景整条曲线的并行计算: 工作进程把曲线直接写入父进程分配的共享内存块, 父进程以 NumPy 视图读取。
+
+结果矩阵不经过 pickle 回传, 父进程拿到的视图可直接用于绘图或导出。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import engine
+
+__all__ = ["DEFAULT_CHUNK_ROWS", "SharedCurves", "curve_block", "compute_curves", "compute_curves_pickled"]
+
+# 每个任务计算的场景数; 10,000 天时每块约 20 MB
+DEFAULT_CHUNK_ROWS = 256
+
+
+class SharedCurves:
+    # values 形状为 (场景, 天数), 是共享内存块上的视图, 行顺序与输入一致
+    # 用完后调用 close() (或使用 with) 释放共享内存; 释放前需先丢弃从 values 派生的视图
+    __slots__ = ("days", "values", "_shm")
+
+    def __init__(self, days, shm, shape):
+        self.days = days
+        self._shm = shm
+        self.values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.values = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def curve_block(inputs, days, out=None):
+    """计算一组输入在 days 各天的金额, 结果形状为 (len(inputs), len(days))。
+
+    无定投的场景一次广播求值; 有定投的场景逐条用 Projection.amounts_at (每条一次前缀和查找)。
+    """
+    days = np.asarray(days, dtype=np.float64)
+    if out is None:
+        out = np.empty((len(inputs), len(days)), dtype=np.float64)
+    plain = [i for i, inp in enumerate(inputs) if inp.contribution is None]
+    if plain:
+        principals = np.array([inputs[i].principal for i in plain])[:, None]
+        growths = np.array([1.0 + inputs[i].rate_per_period for i in plain])[:, None]
+        days_per_period = np.array([inputs[i].days_per_period for i in plain])[:, None]
+        with np.errstate(over="ignore", invalid="ignore"):
+            amounts = np.power(growths, days[None, :] / days_per_period)
+            amounts *= principals
+        # 与 Projection.amounts_at 一致: 本金为 0 时取 0, 避免 0 * inf = NaN
+        amounts[principals[:, 0] == 0] = 0.0
+        if len(plain) == len(inputs):
+            out[...] = amounts
+        else:
+            out[plain] = amounts
+    for i, inp in enumerate(inputs):
+        if inp.contribution is not None:
+            out[i] = engine.run(inp).amounts_at(days)
+    return out
+
+
+def _chunks(count, chunk_rows):
+    return [(start, min(start + chunk_rows, count)) for start in range(0, count, chunk_rows)]
+
+
+# 工作进程内挂载的共享内存与其视图, 由进程池的 initializer 设置一次
+_worker_shm = None
+_worker_values = None
+_worker_days = None
+
+
+def _attach(name, shape, days):
+    global _worker_shm, _worker_values, _worker_days
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_values = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_days = days
+
+
+def _fill_rows(inputs, start):
+    # 把 [start, start + len(inputs)) 行直接写入共享内存, 只回传行数
+    curve_block(inputs, _worker_days, out=_worker_values[start:start + len(inputs)])
+    return len(inputs)
+
+
+def compute_curves(inputs, days, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """并行计算多条曲线, 返回 SharedCurves; 结果写在父进程分配的共享内存中, 不经 pickle 回传。
+
+    inputs 为 engine.ProjectionInput 序列, days 为各曲线共同的采样天数。
+    只有一个块或 workers == 1 时直接在当前进程内写入同一块共享内存。
+    """
+    inputs = list(inputs)
+    days = np.asarray(days, dtype=np.float64)
+    shape = (len(inputs), len(days))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    result = SharedCurves(days, shm, shape)
+    try:
+        bounds = _chunks(len(inputs), chunk_rows)
+        workers = workers or os.cpu_count() or 1
+        if len(bounds) <= 1 or workers == 1:
+            curve_block(inputs, days, out=result.values)
+            return result
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, shape, days)) as executor:
+            futures = [executor.submit(_fill_rows, inputs[start:stop], start) for start, stop in bounds]
+            for future in futures:
+                future.result()
+    except BaseException:
+        result.close()
+        raise
+    return result
+
+
+def compute_curves_pickled(inputs, days, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # 对照实现: 工作进程返回数组, 经 pickle 传回父进程后再拷入结果矩阵
+    inputs = list(inputs)
+    days = np.asarray(days, dtype=np.float64)
+    values = np.empty((len(inputs), len(days)), dtype=np.float64)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [(start, stop, executor.submit(curve_block, inputs[start:stop], days))
+                   for start, stop in _chunks(len(inputs), chunk_rows)]
+        for start, stop, future in futures:
+            values[start:stop] = future.result()
+    return values
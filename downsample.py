@@ -0,0 +1,67 @@
+"""曲线降采样: 按目标点数 (通常为画布像素宽度) 挑选保持形状的点, 返回原数组中的下标。"""
+
+import numpy as np
+
+__all__ = ["METHODS", "lttb_indices", "minmax_indices", "downsample_indices"]
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: 每个桶选出与前一选中点、下一桶均值构成面积最大的点
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 首尾点单独保留, 中间 n - 2 个点均分为 n_out - 2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    bucket_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    bucket_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    next_x = np.append(bucket_x[1:], x[-1])
+    next_y = np.append(bucket_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        areas = np.abs((ax - next_x[i]) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y[i] - ay))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(x, y, n_buckets):
+    # 每个桶保留最小值和最大值两个点, 完全向量化; 适合有起伏 (非单调) 的曲线
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_buckets < 1 or 2 * n_buckets + 2 >= n:
+        return np.arange(n)
+
+    interior = y[1:n - 1]
+    bucket_size = -(-len(interior) // n_buckets)
+    n_buckets = -(-len(interior) // bucket_size)
+    pad = n_buckets * bucket_size - len(interior)
+    lows = np.append(interior, np.full(pad, np.inf)).reshape(n_buckets, bucket_size)
+    highs = np.append(interior, np.full(pad, -np.inf)).reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size + 1
+    picked = np.concatenate((
+        [0],
+        offsets + np.argmin(lows, axis=1),
+        offsets + np.argmax(highs, axis=1),
+        [n - 1],
+    ))
+    return np.unique(picked)
+
+
+def downsample_indices(x, y, n_out, method="lttb"):
+    # n_out 为期望输出的点数; minmax 每桶两点, 因此桶数取一半
+    if method == "lttb":
+        return lttb_indices(x, y, n_out)
+    if method == "minmax":
+        return minmax_indices(x, y, max(1, (n_out - 2) // 2))
+    raise ValueError(f"未知的降采样方法: {method}")
@@ -0,0 +1,416 @@
+"""复利计算引擎: 纯 Python/NumPy 实现, 不依赖任何界面库, 可在批处理或服务端直接导入。"""
+
+import math
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+import numpy as np
+
+__all__ = [
+    "UNIT_TO_DAYS",
+    "FREQ_TO_DAYS",
+    "InputError",
+    "CalculationCancelled",
+    "Contribution",
+    "ProjectionInput",
+    "Projection",
+    "ProjectionStack",
+    "Summary",
+    "CalculationResult",
+    "make_input",
+    "project",
+    "run",
+    "summarize",
+    "format_number",
+    "format_log_amount",
+    "format_summary",
+    "calculate",
+]
+
+# --- 单位换算 (与界面选项保持一致) ---
+UNIT_TO_DAYS = {"年": 365, "月": 30, "周": 7, "日": 1}
+FREQ_TO_DAYS = {"按年": 365.0, "按月": 30.0, "按日": 1.0}
+# 绝对值达到该值的金额/收益率用科学计数法展示
+SCIENTIFIC_THRESHOLD = 1e15
+
+
+class InputError(ValueError):
+    pass
+
+
+class CalculationCancelled(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Contribution:
+    # 定投: 从 start_day 起每隔 every_days 天投入 amount (负数表示取出), 到 end_day (含) 为止;
+    # end_day 为 None 表示一直持续到最后一天; 每满一年金额按 step_up_percent 递增
+    amount: float
+    every_days: float
+    start_day: float = 0.0
+    end_day: Optional[float] = None
+    step_up_percent: float = 0.0
+
+    def schedule(self, last_day: float) -> Tuple[np.ndarray, np.ndarray]:
+        """返回 (投入日, 投入金额) 两个数组, 只包含不晚于 last_day 的投入。"""
+        end = last_day if self.end_day is None else min(self.end_day, last_day)
+        if end < self.start_day:
+            return np.empty(0), np.empty(0)
+        count = int(np.floor((end - self.start_day) / self.every_days)) + 1
+        offsets = np.arange(count) * float(self.every_days)
+        amounts = np.full(count, float(self.amount))
+        if self.step_up_percent:
+            amounts *= np.power(1.0 + self.step_up_percent / 100.0, np.floor(offsets / 365.0))
+        return self.start_day + offsets, amounts
+
+    def scaled(self, factor: float) -> "Contribution":
+        return replace(self, amount=self.amount * factor)
+
+
+@dataclass(frozen=True)
+class ProjectionInput:
+    principal: float
+    rate_percent: float
+    frequency: str
+    total_days: float
+    contribution: Optional[Contribution] = None
+
+    @property
+    def rate_per_period(self) -> float:
+        return self.rate_percent / 100.0
+
+    @property
+    def days_per_period(self) -> float:
+        return FREQ_TO_DAYS[self.frequency]
+
+
+@dataclass(frozen=True)
+class Summary:
+    final_amount: float
+    total_interest: float
+    return_rate: Optional[float]
+    total_invested: float
+    # 本息总额超出浮点范围 (inf) 时给出其自然对数, 否则为 None
+    log_final_amount: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CalculationResult:
+    projection: "Projection"
+    summary: Summary
+    formatted: Tuple[str, str, str, str]
+
+
+class Projection:
+    # 只保存参数, 按需对任意天数计算闭式解: principal * growth ** (day / days_per_period)
+    # 图表、悬停提示和结果标签各自只请求实际需要的点, 不再逐日生成整条曲线
+    # 有定投时, 每笔投入先折现到第 0 天再做前缀和: 第 d 天的定投部分
+    #   = growth ** (d / days_per_period) * sum(a_k * growth ** (-t_k / days_per_period), t_k <= d)
+    # 任意一组天数用一次二分查找即可求值, 总开销与投入笔数成线性
+    # 定期取出把余额取完后停止: depletion_day 为余额首次不为正的取出日 (未取完时为 None),
+    # 从这天起金额为 0, 累计投入只计入实际取出的部分
+    __slots__ = ("principal", "rate_per_period", "days_per_period", "last_day", "contribution", "depletion_day",
+                 "_deposit_days", "_discounted", "_deposited", "_log_discounted", "_depleted_invested")
+
+    def __init__(self, principal: float, rate_per_period: float, days_per_period: float,
+                 last_day: int, contribution: Optional[Contribution] = None):
+        self.principal = principal
+        self.rate_per_period = rate_per_period
+        self.days_per_period = days_per_period
+        self.last_day = last_day
+        self.contribution = contribution
+        self.depletion_day = None
+        self._deposit_days = None
+        self._discounted = None
+        self._deposited = None
+        self._log_discounted = None
+        self._depleted_invested = None
+        if contribution is not None:
+            deposit_days, amounts = contribution.schedule(last_day)
+            with np.errstate(over="ignore", under="ignore"):
+                discount = np.power(1.0 + rate_per_period, -deposit_days / days_per_period)
+            self._deposit_days = deposit_days
+            self._discounted = np.cumsum(amounts * discount)
+            self._deposited = np.cumsum(amounts)
+            if contribution.amount < 0:
+                self._find_depletion()
+
+    def _find_depletion(self):
+        # 折现到第 0 天的余额 principal + 前缀和 随取出单调减小, 首个不为正的取出日即为取完的那天;
+        # 这天实际取出的只是取出前的余额
+        depleted = self.principal + self._discounted <= 0
+        if not depleted.any():
+            return
+        k = int(np.argmax(depleted))
+        day = float(self._deposit_days[k])
+        before = self.principal + (self._discounted[k - 1] if k else 0.0)
+        with np.errstate(over="ignore", invalid="ignore"):
+            remaining = before * np.power(1.0 + self.rate_per_period, day / self.days_per_period)
+        self.depletion_day = day
+        self._depleted_invested = self.principal + (self._deposited[k - 1] if k else 0.0) - remaining
+
+    def __len__(self) -> int:
+        return self.last_day + 1
+
+    def _deposit_counts(self, days: np.ndarray) -> np.ndarray:
+        # 截至每个查询日 (含当天) 已发生的投入笔数
+        return np.searchsorted(self._deposit_days, days, side="right")
+
+    def amounts_at(self, days) -> np.ndarray:
+        days = np.asarray(days, dtype=np.float64)
+        with np.errstate(over="ignore", invalid="ignore"):
+            growth = np.power(1.0 + self.rate_per_period, days / self.days_per_period)
+            # 本金为 0 时直接取 0, 避免增长倍数溢出时出现 0 * inf = NaN
+            amounts = self.principal * growth if self.principal else np.zeros_like(growth)
+            if self._discounted is not None and len(self._discounted):
+                counts = self._deposit_counts(days)
+                discounted = np.where(counts > 0, self._discounted[np.maximum(counts - 1, 0)], 0.0)
+                amounts = amounts + growth * discounted
+        if self.depletion_day is not None:
+            amounts = np.where(days >= self.depletion_day, 0.0, amounts)
+        return amounts
+
+    def amount_at(self, day: float) -> float:
+        return float(self.amounts_at(day))
+
+    def log_amounts_at(self, days) -> np.ndarray:
+        """各天金额的自然对数, 在对数空间用 log1p 计算, 金额超出浮点范围时仍然有限。
+
+        本金为 0 的部分取 -inf; 定期取出把余额取完后 (金额为 0) 也为 -inf。
+        """
+        days = np.asarray(days, dtype=np.float64)
+        log_growth = np.log1p(self.rate_per_period) / self.days_per_period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logs = np.log(self.principal) + days * log_growth
+            if self._discounted is not None and len(self._discounted):
+                if self._log_discounted is None:
+                    # 同一定投的每笔金额同号, 对绝对值做对数域前缀和 (logaddexp 累积), 不会上溢或下溢
+                    deposit_days, amounts = self.contribution.schedule(self.last_day)
+                    self._log_discounted = np.logaddexp.accumulate(np.log(np.abs(amounts)) - deposit_days * log_growth)
+                counts = self._deposit_counts(days)
+                contributed = np.where(counts > 0, self._log_discounted[np.maximum(counts - 1, 0)], -np.inf)
+                contributed = contributed + days * log_growth
+                if self.contribution.amount > 0:
+                    logs = np.logaddexp(logs, contributed)
+                else:
+                    logs = logs + np.log1p(-np.exp(contributed - logs))
+        if self.depletion_day is not None:
+            logs = np.where(days >= self.depletion_day, -np.inf, logs)
+        return logs
+
+    def invested_at(self, days) -> np.ndarray:
+        # 截至各天的累计投入 (本金 + 定投), 用于计算收益与收益率
+        days = np.asarray(days, dtype=np.float64)
+        if self._deposited is None or not len(self._deposited):
+            return np.full(days.shape, float(self.principal))
+        counts = self._deposit_counts(days)
+        invested = self.principal + np.where(counts > 0, self._deposited[np.maximum(counts - 1, 0)], 0.0)
+        if self.depletion_day is not None:
+            invested = np.where(days >= self.depletion_day, self._depleted_invested, invested)
+        return invested
+
+    def sample_days(self, step: int) -> np.ndarray:
+        # 每隔 step 天取一点, 并保证最后一天一定包含在内
+        days = np.arange(0, self.last_day + 1, step, dtype=np.int64)
+        if days[-1] != self.last_day:
+            days = np.append(days, self.last_day)
+        return days
+
+    @property
+    def final_amount(self) -> float:
+        return self.amount_at(self.last_day)
+
+    @property
+    def log_final_amount(self) -> float:
+        return float(self.log_amounts_at(self.last_day))
+
+    @property
+    def total_invested(self) -> float:
+        return float(self.invested_at(self.last_day))
+
+    @property
+    def scale(self) -> float:
+        # 曲线对 (本金, 定投金额) 是线性的: 两者同乘 k, 整条曲线也乘 k
+        # 以本金为尺度; 只有定投没有本金时以定投金额的绝对值为尺度
+        if self.principal == 0 and self.contribution is not None and self.contribution.amount != 0:
+            return abs(self.contribution.amount)
+        return self.principal
+
+    def _unit_params(self) -> Tuple[float, Optional[Contribution]]:
+        scale = self.scale
+        if self.contribution is None or scale == 0:
+            # 无定投, 或本金与定投金额都为 0 (曲线恒为 0, 只需保留增长倍数)
+            return 1.0, None
+        return self.principal / scale, self.contribution.scaled(1.0 / scale)
+
+    @property
+    def unit_key(self) -> Tuple[float, float, int, Optional[Contribution]]:
+        # 除以尺度后同一键下的曲线形状完全相同; 无定投时即 (利率, 频率, 天数)
+        return (self.rate_per_period, self.days_per_period, self.last_day, self._unit_params()[1])
+
+    def unit(self) -> "Projection":
+        # 尺度为 1 的同形曲线: 任意曲线 = scale * unit 曲线
+        principal, contribution = self._unit_params()
+        return Projection(principal, self.rate_per_period, self.days_per_period, self.last_day, contribution)
+
+
+class ProjectionStack:
+    # 把多条曲线的参数堆叠为数组, 一次广播即可求出所有曲线在同一时间点的金额
+    # 带定投的曲线另外加上各自的定投部分 (每条一次二分查找)
+    # 超出某条曲线最后一天的时间点不外推, 该曲线的结果为 NaN
+    __slots__ = ("principals", "growths", "days_per_period", "last_days", "projections")
+
+    def __init__(self, projections):
+        self.projections = list(projections)
+        self.principals = np.array([p.principal for p in self.projections], dtype=np.float64)
+        self.growths = np.array([1.0 + p.rate_per_period for p in self.projections], dtype=np.float64)
+        self.days_per_period = np.array([p.days_per_period for p in self.projections], dtype=np.float64)
+        self.last_days = np.array([p.last_day for p in self.projections], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.principals)
+
+    def amounts_at(self, day: float) -> np.ndarray:
+        with np.errstate(over="ignore"):
+            amounts = self.principals * np.power(self.growths, day / self.days_per_period)
+        for i, projection in enumerate(self.projections):
+            if projection.contribution is not None:
+                amounts[i] = projection.amount_at(day)
+        amounts[day > self.last_days] = np.nan
+        return amounts
+
+    def log_amounts_at(self, day: float) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            logs = np.log(self.principals) + np.log1p(self.growths - 1.0) * (day / self.days_per_period)
+        for i, projection in enumerate(self.projections):
+            if projection.contribution is not None:
+                logs[i] = float(projection.log_amounts_at(day))
+        logs[day > self.last_days] = np.nan
+        return logs
+
+
+def make_input(principal: float, rate_percent: float, frequency: str,
+               duration_value: float, duration_unit: str,
+               contribution_amount: float = 0.0, contribution_unit: str = "月",
+               contribution_start_day: float = 0.0, contribution_end_day: Optional[float] = None,
+               step_up_percent: float = 0.0) -> ProjectionInput:
+    """把界面/批处理的原始输入换算成天数并校验, 不合法时抛出 InputError。
+
+    contribution_amount 非 0 时按 contribution_unit (年/月/周/日) 定期投入, 负数表示定期取出;
+    起止日以天为单位, 结束日缺省时持续到最后一天。
+    """
+    principal = float(principal)
+    rate_percent = float(rate_percent)
+    duration_value = float(duration_value)
+    contribution_amount = float(contribution_amount)
+    # float() 接受 "inf"/"nan": 这些值会在取整天数或比较大小时出错或被静默放过
+    if not all(math.isfinite(v) for v in (principal, rate_percent, duration_value, contribution_amount)):
+        raise InputError("请输入有效的数字！")
+    if frequency not in FREQ_TO_DAYS:
+        raise InputError(f"未知的复利频率: {frequency}")
+    total_days = duration_value * UNIT_TO_DAYS.get(duration_unit, 0)
+    if not math.isfinite(total_days):
+        raise InputError("时长过大。")
+    if principal < 0 or rate_percent < 0 or total_days <= 0:
+        raise InputError("本金、利率必须为正数，且时长必须大于0。")
+
+    contribution = None
+    if contribution_amount != 0:
+        if contribution_unit not in UNIT_TO_DAYS:
+            raise InputError(f"未知的定投周期: {contribution_unit}")
+        start_day = float(contribution_start_day)
+        end_day = None if contribution_end_day is None else float(contribution_end_day)
+        step_up_percent = float(step_up_percent)
+        # 结束日为 inf 等同于缺省 (持续到最后一天)
+        if not (math.isfinite(start_day) and math.isfinite(step_up_percent)) or (end_day is not None and math.isnan(end_day)):
+            raise InputError("请输入有效的数字！")
+        if start_day < 0 or (end_day is not None and end_day < start_day):
+            raise InputError("定投开始日不能为负数，且结束日不能早于开始日。")
+        if step_up_percent <= -100:
+            raise InputError("定投每年递增比例必须大于 -100%。")
+        contribution = Contribution(contribution_amount, float(UNIT_TO_DAYS[contribution_unit]),
+                                    start_day, end_day, step_up_percent)
+    return ProjectionInput(principal, rate_percent, frequency, total_days, contribution)
+
+
+def project(principal: float, rate_per_period: float, days_per_period: float,
+            total_days: float, contribution: Optional[Contribution] = None) -> Projection:
+    return Projection(principal, rate_per_period, days_per_period, int(total_days), contribution)
+
+
+def run(inp: ProjectionInput) -> Projection:
+    return project(inp.principal, inp.rate_per_period, inp.days_per_period, inp.total_days, inp.contribution)
+
+
+def summarize(projection: Projection) -> Summary:
+    return _make_summary(projection.final_amount, projection.total_invested, projection)
+
+
+def _make_summary(final_amount: float, total_invested: float, projection: Projection) -> Summary:
+    # 收益与收益率都相对于累计投入 (本金 + 定投); 累计投入不为正时收益率为 N/A
+    # 常见情况只做一次标量运算; 只有结果溢出时才在对数空间重新计算最终金额
+    total_interest = final_amount - total_invested
+    return_rate = (total_interest / total_invested) * 100 if total_invested > 0 else None
+    log_final_amount = None
+    if not np.isfinite(final_amount):
+        log_final_amount = projection.log_final_amount
+    return Summary(final_amount, total_interest, return_rate, total_invested, log_final_amount)
+
+
+def format_log_amount(log_value: float) -> str:
+    """把自然对数形式的金额格式化为科学计数法, 例如 1.23e+500; 用于超出浮点范围的结果。"""
+    if not np.isfinite(log_value):
+        return "N/A"
+    log10_value = log_value / np.log(10.0)
+    exponent = int(np.floor(log10_value))
+    mantissa = 10.0 ** (log10_value - exponent)
+    if mantissa >= 9.995:
+        mantissa, exponent = mantissa / 10.0, exponent + 1
+    return f"{mantissa:.2f}e{exponent:+d}"
+
+
+def format_summary(summary: Summary) -> Tuple[str, str, str, str]:
+    """返回 (本息总额, 总收益, 总收益率, 累计投入) 四个展示用字符串。"""
+    formatted_invested = f"¥ {summary.total_invested:,.2f}"
+    if summary.log_final_amount is not None:
+        # 金额溢出时累计投入相对可以忽略: 总收益与总额同量级, 收益率 ≈ 总额 / 累计投入 * 100
+        formatted_amount = f"¥ {format_log_amount(summary.log_final_amount)}"
+        if summary.total_invested > 0:
+            log_rate = summary.log_final_amount - np.log(summary.total_invested) + np.log(100.0)
+            formatted_rate = f"{format_log_amount(log_rate)} %"
+        else:
+            formatted_rate = "N/A"
+        return formatted_amount, formatted_amount, formatted_rate, formatted_invested
+
+    if summary.return_rate is not None:
+        formatted_rate = f"{format_number(summary.return_rate)} %"
+    else:
+        formatted_rate = "N/A"
+    formatted_amount = f"¥ {format_number(summary.final_amount)}"
+    formatted_interest = f"¥ {format_number(summary.total_interest)}"
+    return formatted_amount, formatted_interest, formatted_rate, formatted_invested
+
+
+def format_number(value: float) -> str:
+    return f"{value:,.2f}" if abs(value) < SCIENTIFIC_THRESHOLD else f"{value:.2e}"
+
+
+def calculate(inp: ProjectionInput, cache=None) -> CalculationResult:
+    """计算曲线、汇总与展示字符串; 传入 cache (如 cache.LRUCache) 时复用已算过的增长倍数。
+
+    缓存按 unit_key 存放尺度为 1 的最终金额, 与本金无关:
+    只改变本金 (无定投时) 或按同一比例缩放本金与定投金额的场景都命中同一条目,
+    结果由一次标量乘法得到。
+    """
+    projection = run(inp)
+    if cache is None:
+        final_amount = projection.final_amount
+    elif projection.scale == 0:
+        # 本金与定投都为 0: 曲线恒为 0, 不能用 0 * 增长倍数 (可能为 inf) 求得
+        final_amount = 0.0
+    else:
+        growth = cache.get_or_compute(projection.unit_key, lambda: projection.unit().final_amount)
+        final_amount = projection.scale * growth
+    summary = _make_summary(final_amount, projection.total_invested, projection)
+    return CalculationResult(projection, summary, format_summary(summary))
@@ -0,0 +1,115 @@
+"""逐日明细导出: 按块生成 (天数, 日期, 金额, 累计投入, 收益, 累计收益率) 并流式写入 CSV 或 Parquet。
+
+任意时刻只持有一个块, 内存占用与总天数无关。Parquet 需要可选依赖 pyarrow。
+"""
+
+import csv
+import datetime
+import importlib.util
+import os
+
+import numpy as np
+
+import engine
+
+__all__ = ["COLUMNS", "FORMATS", "DEFAULT_CHUNK_ROWS", "parquet_available", "iter_schedule",
+           "write_csv", "write_parquet", "export_schedule"]
+
+COLUMNS = ("day", "date", "amount", "invested", "interest", "cumulative_return")
+FORMATS = ("csv", "parquet")
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+def parquet_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _row_count(projection, step):
+    # 与 Projection.sample_days(step) 的长度一致, 但不生成数组
+    return -(-projection.last_day // step) + 1
+
+
+def iter_schedule(projection, step=1, start_date=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """按块产出明细, 每块为 {列名: NumPy 数组} 字典; 每隔 step 天一行, 最后一天总会包含在内。
+
+    start_date 为第 0 天对应的日期 (datetime.date), 缺省为今天; 累计收益率单位为 %,
+    累计投入不为正时为 NaN。
+    """
+    start = np.datetime64(start_date or datetime.date.today(), "D")
+    total = _row_count(projection, step)
+    for begin in range(0, total, chunk_rows):
+        end = min(begin + chunk_rows, total)
+        days = np.arange(begin, end, dtype=np.int64) * step
+        if end == total:
+            # 最后一块: 不足一个步长的尾部补上最后一天
+            days = np.minimum(days, projection.last_day)
+            days[-1] = projection.last_day
+        amounts = projection.amounts_at(days)
+        invested = projection.invested_at(days)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            interest = amounts - invested
+            returns = np.where(invested > 0, interest / invested * 100, np.nan)
+        yield {
+            "day": days,
+            "date": start + days.astype("timedelta64[D]"),
+            "amount": amounts,
+            "invested": invested,
+            "interest": interest,
+            "cumulative_return": returns,
+        }
+
+
+def _report(progress, done, total):
+    if progress is not None:
+        progress(done / total)
+
+
+def write_csv(projection, path, step=1, start_date=None, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    # 返回写出的行数; progress 为可选回调, 每写完一块以完成比例调用一次
+    total = _row_count(projection, step)
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in iter_schedule(projection, step, start_date, chunk_rows):
+            chunk["date"] = chunk["date"].astype(str)
+            writer.writerows(zip(*(chunk[column].tolist() for column in COLUMNS)))
+            written += len(chunk["day"])
+            _report(progress, written, total)
+    return written
+
+
+def write_parquet(projection, path, step=1, start_date=None, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    # 每块写成一个 row group, 不在内存中拼出整张表
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise engine.InputError("导出 Parquet 需要安装 pyarrow (pip install pyarrow)。") from None
+
+    schema = pa.schema([
+        ("day", pa.int64()),
+        ("date", pa.date32()),
+        ("amount", pa.float64()),
+        ("invested", pa.float64()),
+        ("interest", pa.float64()),
+        ("cumulative_return", pa.float64()),
+    ])
+    total = _row_count(projection, step)
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in iter_schedule(projection, step, start_date, chunk_rows):
+            writer.write_table(pa.table(chunk, schema=schema))
+            written += len(chunk["day"])
+            _report(progress, written, total)
+    return written
+
+
+def export_schedule(projection, path, step=1, start_date=None, fmt=None, progress=None):
+    """按扩展名 (或 fmt) 选择 CSV / Parquet 写出明细, 返回行数。"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+    if fmt == "csv":
+        return write_csv(projection, path, step, start_date, progress=progress)
+    if fmt == "parquet":
+        return write_parquet(projection, path, step, start_date, progress=progress)
+    raise engine.InputError(f"不支持的导出格式: {fmt}")
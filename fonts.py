@@ -0,0 +1,22 @@
+import time
+
+from matplotlib import font_manager
+
+# --- 中文字体解析: 在已登记字体中查找一次可用的中文字体, 之后 font.sans-serif 只设置这一项 ---
+CJK_FONT_CANDIDATES = ['Microsoft YaHei', 'PingFang SC', 'SimHei', 'WenQuanYi Zen Hei', 'Noto Sans CJK SC']
+
+
+def _find_cjk_font():
+    # 按候选顺序在已登记字体中精确匹配名称, 返回字体名; 只是一次集合查找, 不需要磁盘缓存
+    names = {entry.name for entry in font_manager.fontManager.ttflist}
+    for family in CJK_FONT_CANDIDATES:
+        if family in names:
+            return family
+    return None
+
+
+def resolve_cjk_font():
+    # 返回 (字体名或 None, 耗时秒数)
+    start = time.perf_counter()
+    family = _find_cjk_font()
+    return family, time.perf_counter() - start
@@ -0,0 +1,508 @@
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+import locale
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import engine
+import export
+import montecarlo
+import solver
+import sweep
+from cache import LRUCache
+
+try:
+    locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
+except locale.Error:
+    try:
+        locale.setlocale(locale.LC_ALL, 'English_United States.1252')
+    except locale.Error:
+        print("警告：无法设置本地化。")
+
+CHART_LOAD_DELAY_MS = 100
+POLL_INTERVAL_MS = 50
+RESULT_CACHE_ENTRIES = 256
+RESULT_CACHE_BYTES = 16 * 1024 * 1024
+CONTRIBUTION_CADENCES = {"每月": "月", "每周": "周", "每日": "日", "每年": "年"}
+GOAL_SEEK_FIELDS = {"本金": "principal", "收益率": "rate", "时长": "duration"}
+RETURN_MODES = {"固定收益率": None, "正态分布": "normal", "对数正态": "lognormal", "历史数据 (CSV)": "bootstrap"}
+MONTE_CARLO_SEED = 42
+
+
+class CalculationJob:
+    # 后台计算任务: 取消标志与进度由工作线程写入, Tk 线程通过 after() 轮询读取
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.progress = None
+        self.future = None
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report(self, fraction):
+        # 供耗时计算在循环中调用: 更新进度, 已取消时中止
+        if self.cancelled.is_set():
+            raise engine.CalculationCancelled()
+        self.progress = fraction
+
+
+class VisualCompoundInterestCalculator(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.title("高级交互式复利计算器")
+        self.geometry("700x950")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self._set_appearance_mode("System")
+
+        # --- 字体设置 ---
+        self.title_font = ctk.CTkFont(family="Helvetica", size=26, weight="bold")
+        self.label_font = ctk.CTkFont(family="Helvetica", size=14)
+        self.helper_font = ctk.CTkFont(family="Helvetica", size=12, slant="italic")
+        self.button_font = ctk.CTkFont(family="Helvetica", size=14, weight="bold")
+        self.result_font = ctk.CTkFont(family="Helvetica", size=18, weight="bold")
+        self.result_value_font = ctk.CTkFont(family="Courier New", size=20, weight="bold")
+
+        main_frame = ctk.CTkScrollableFrame(self, corner_radius=15)
+        main_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
+        main_frame.grid_columnconfigure(1, weight=1)
+        
+        # --- UI组件部分 ---
+        title_label = ctk.CTkLabel(main_frame, text="复利的力量", font=self.title_font)
+        title_label.grid(row=0, column=0, columnspan=2, padx=20, pady=(10, 20))
+        ctk.CTkLabel(main_frame, text="初始本金 (P)", font=self.label_font).grid(row=1, column=0, padx=20, pady=10, sticky="w")
+        self.principal_entry = ctk.CTkEntry(main_frame, placeholder_text="例如: 1000", font=self.label_font)
+        self.principal_entry.grid(row=1, column=1, padx=20, pady=10, sticky="ew")
+        self.principal_entry.insert(0, "1000")
+        ctk.CTkLabel(main_frame, text="复利计算频率", font=self.label_font).grid(row=2, column=0, padx=20, pady=10, sticky="w")
+        self.frequency_selector = ctk.CTkSegmentedButton(main_frame, values=["按日", "按月", "按年"], font=self.label_font, command=self.update_rate_helper_text)
+        self.frequency_selector.grid(row=2, column=1, padx=20, pady=10, sticky="ew")
+        self.frequency_selector.set("按月")
+        ctk.CTkLabel(main_frame, text="收益率 (%)", font=self.label_font).grid(row=3, column=0, padx=20, pady=(10,0), sticky="w")
+        self.rate_entry = ctk.CTkEntry(main_frame, placeholder_text="例如: 10", font=self.label_font)
+        self.rate_entry.grid(row=3, column=1, padx=20, pady=(10,0), sticky="ew")
+        self.rate_entry.insert(0, "10")
+        self.rate_helper_label = ctk.CTkLabel(main_frame, text="", font=self.helper_font, text_color="gray")
+        self.rate_helper_label.grid(row=4, column=1, padx=20, pady=(0, 10), sticky="w")
+        ctk.CTkLabel(main_frame, text="复利总时间", font=self.label_font).grid(row=5, column=0, padx=20, pady=10, sticky="w")
+        duration_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        duration_frame.grid(row=5, column=1, padx=20, pady=10, sticky="ew")
+        duration_frame.grid_columnconfigure(0, weight=2)
+        duration_frame.grid_columnconfigure(1, weight=1)
+        self.duration_value_entry = ctk.CTkEntry(duration_frame, font=self.label_font)
+        self.duration_value_entry.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        self.duration_value_entry.insert(0, "1")
+        self.duration_unit_selector = ctk.CTkOptionMenu(duration_frame, values=["年", "月", "周", "日"], font=self.label_font)
+        self.duration_unit_selector.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        self.duration_unit_selector.set("年")
+        ctk.CTkLabel(main_frame, text="定投金额 (负数为取出)", font=self.label_font).grid(row=6, column=0, padx=20, pady=10, sticky="w")
+        contribution_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        contribution_frame.grid(row=6, column=1, padx=20, pady=10, sticky="ew")
+        contribution_frame.grid_columnconfigure(0, weight=2)
+        contribution_frame.grid_columnconfigure(1, weight=1)
+        self.contribution_entry = ctk.CTkEntry(contribution_frame, placeholder_text="例如: 500", font=self.label_font)
+        self.contribution_entry.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        self.contribution_entry.insert(0, "0")
+        self.contribution_cadence_selector = ctk.CTkOptionMenu(contribution_frame, values=list(CONTRIBUTION_CADENCES), font=self.label_font)
+        self.contribution_cadence_selector.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        self.contribution_cadence_selector.set("每月")
+        ctk.CTkLabel(main_frame, text="定投起止日 (天)", font=self.label_font).grid(row=7, column=0, padx=20, pady=10, sticky="w")
+        contribution_days_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        contribution_days_frame.grid(row=7, column=1, padx=20, pady=10, sticky="ew")
+        contribution_days_frame.grid_columnconfigure((0, 1), weight=1)
+        self.contribution_start_entry = ctk.CTkEntry(contribution_days_frame, placeholder_text="开始日, 例如: 0", font=self.label_font)
+        self.contribution_start_entry.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        self.contribution_start_entry.insert(0, "0")
+        self.contribution_end_entry = ctk.CTkEntry(contribution_days_frame, placeholder_text="结束日, 留空为到期", font=self.label_font)
+        self.contribution_end_entry.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        ctk.CTkLabel(main_frame, text="定投每年递增 (%)", font=self.label_font).grid(row=8, column=0, padx=20, pady=10, sticky="w")
+        self.step_up_entry = ctk.CTkEntry(main_frame, placeholder_text="例如: 5", font=self.label_font)
+        self.step_up_entry.grid(row=8, column=1, padx=20, pady=10, sticky="ew")
+        self.step_up_entry.insert(0, "0")
+        ctk.CTkLabel(main_frame, text="目标金额 (反求)", font=self.label_font).grid(row=9, column=0, padx=20, pady=10, sticky="w")
+        goal_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        goal_frame.grid(row=9, column=1, padx=20, pady=10, sticky="ew")
+        goal_frame.grid_columnconfigure(0, weight=2)
+        self.goal_entry = ctk.CTkEntry(goal_frame, placeholder_text="例如: 1000000", font=self.label_font)
+        self.goal_entry.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        self.goal_field_selector = ctk.CTkOptionMenu(goal_frame, values=list(GOAL_SEEK_FIELDS), font=self.label_font, width=90)
+        self.goal_field_selector.grid(row=0, column=1, padx=5)
+        self.goal_field_selector.set("收益率")
+        ctk.CTkButton(goal_frame, text="求解", font=self.label_font, width=70, command=self.goal_seek).grid(row=0, column=2, padx=(5, 0))
+        ctk.CTkLabel(main_frame, text="收益模式", font=self.label_font).grid(row=10, column=0, padx=20, pady=10, sticky="w")
+        self.return_mode_selector = ctk.CTkOptionMenu(main_frame, values=list(RETURN_MODES), font=self.label_font, command=self.on_return_mode_change)
+        self.return_mode_selector.grid(row=10, column=1, padx=20, pady=10, sticky="ew")
+        self.return_mode_selector.set("固定收益率")
+        ctk.CTkLabel(main_frame, text="波动率 (%/期) / 路径数", font=self.label_font).grid(row=11, column=0, padx=20, pady=10, sticky="w")
+        simulation_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        simulation_frame.grid(row=11, column=1, padx=20, pady=10, sticky="ew")
+        simulation_frame.grid_columnconfigure((0, 1), weight=1)
+        self.volatility_entry = ctk.CTkEntry(simulation_frame, placeholder_text="例如: 4", font=self.label_font)
+        self.volatility_entry.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        self.volatility_entry.insert(0, "4")
+        self.paths_entry = ctk.CTkEntry(simulation_frame, placeholder_text="例如: 10000", font=self.label_font)
+        self.paths_entry.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        self.paths_entry.insert(0, str(montecarlo.DEFAULT_PATHS))
+        self.return_history = None
+        self.calculate_button = ctk.CTkButton(main_frame, text="计算并生成图表", font=self.button_font, command=self.calculate, height=40)
+        self.calculate_button.grid(row=12, column=0, columnspan=2, padx=20, pady=(30, 20), sticky="ew")
+        self.progress_bar = ctk.CTkProgressBar(main_frame, mode="indeterminate")
+        self.progress_bar.grid(row=13, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="ew")
+        self.progress_bar.grid_remove()
+        
+        # --- 结果显示区域 ---
+        result_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        result_frame.grid(row=14, column=0, columnspan=2, padx=20, pady=10, sticky="ew")
+        result_frame.grid_columnconfigure(0, weight=1)
+        
+        ctk.CTkLabel(result_frame, text="本息总额 (Total Amount)", font=self.result_font, text_color=("blue", "cyan")).grid(row=0, column=0, pady=(10,5))
+        self.total_amount_label = ctk.CTkLabel(result_frame, text="¥ 0.00", font=self.result_value_font, wraplength=600)
+        self.total_amount_label.grid(row=1, column=0, padx=10, pady=(0,10))
+        
+        ctk.CTkLabel(result_frame, text="总收益 (Total Interest)", font=self.result_font, text_color=("green", "#33FF99")).grid(row=2, column=0, pady=(10,5))
+        self.total_interest_label = ctk.CTkLabel(result_frame, text="¥ 0.00", font=self.result_value_font, wraplength=600)
+        self.total_interest_label.grid(row=3, column=0, padx=10, pady=(0,10))
+        
+        ctk.CTkLabel(result_frame, text="总收益率 (Return Rate)", font=self.result_font, text_color=("orange", "#FFA500")).grid(row=4, column=0, pady=(10,5))
+        self.return_rate_label = ctk.CTkLabel(result_frame, text="0.00 %", font=self.result_value_font, wraplength=600)
+        self.return_rate_label.grid(row=5, column=0, padx=10, pady=(0,10))
+        
+        ctk.CTkLabel(result_frame, text="累计投入 (Total Invested)", font=self.result_font, text_color=("purple", "#C39BD3")).grid(row=6, column=0, pady=(10,5))
+        self.total_invested_label = ctk.CTkLabel(result_frame, text="¥ 0.00", font=self.result_value_font, wraplength=600)
+        self.total_invested_label.grid(row=7, column=0, padx=10, pady=(0,10))
+        
+        ctk.CTkLabel(result_frame, text="模拟结果 (Monte Carlo)", font=self.result_font, text_color=("gray30", "gray70")).grid(row=8, column=0, pady=(10,5))
+        self.simulation_label = ctk.CTkLabel(result_frame, text="未启用", font=self.label_font, wraplength=600)
+        self.simulation_label.grid(row=9, column=0, padx=10, pady=(0,20))
+        
+        chart_frame = ctk.CTkFrame(main_frame)
+        chart_frame.grid(row=15, column=0, columnspan=2, padx=20, pady=20, sticky="nsew")
+        chart_frame.grid_columnconfigure(0, weight=1)
+        chart_control_frame = ctk.CTkFrame(chart_frame, fg_color="transparent")
+        chart_control_frame.grid(row=0, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        ctk.CTkLabel(chart_control_frame, text="图表周期:", font=self.label_font).pack(side="left", padx=(0,10))
+        self.chart_period_selector = ctk.CTkSegmentedButton(chart_control_frame, values=["日", "周", "月", "年"], font=self.label_font, command=self.update_plot)
+        self.chart_period_selector.pack(side="left")
+        self.chart_period_selector.set("月")
+        ctk.CTkLabel(chart_control_frame, text="视图:", font=self.label_font).pack(side="left", padx=(20,10))
+        self.chart_view_selector = ctk.CTkSegmentedButton(chart_control_frame, values=["曲线", "热力图"], font=self.label_font, command=self.update_plot)
+        self.chart_view_selector.pack(side="left")
+        self.chart_view_selector.set("曲线")
+        scenario_frame = ctk.CTkFrame(chart_frame, fg_color="transparent")
+        scenario_frame.grid(row=2, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        ctk.CTkButton(scenario_frame, text="固定当前方案", font=self.label_font, width=120, command=self.pin_scenario).pack(side="left", padx=(0,10))
+        ctk.CTkButton(scenario_frame, text="清除固定方案", font=self.label_font, width=120, fg_color="gray", command=self.clear_pinned_scenarios).pack(side="left")
+        ctk.CTkButton(scenario_frame, text="导出明细", font=self.label_font, width=120, command=self.export_schedule).pack(side="right")
+
+        # --- 图表子系统延迟加载: 先显示输入表单, 窗口绘制完成后再导入 matplotlib ---
+        self.chart_frame = chart_frame
+        self.chart = None
+        self.plot_data = None
+        self.last_input = None
+        # last_input 的敏感性网格: 在后台线程中构建, 切换图表周期时只重新绘制
+        self.heatmap_grid = None
+        self._grid_job = None
+        self.chart_loading_label = ctk.CTkLabel(chart_frame, text="图表加载中...", font=self.helper_font, text_color="gray", height=400)
+        self.chart_loading_label.grid(row=1, column=0, sticky="nsew")
+
+        # --- 后台计算: 单个工作线程, 再次点击计算时取消上一个任务 ---
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._job = None
+        # 导出明细用单独的线程: 长时间的导出不阻塞之后的计算
+        self._export_executor = ThreadPoolExecutor(max_workers=1)
+        self._export_job = None
+        self.result_cache = LRUCache(max_entries=RESULT_CACHE_ENTRIES, max_bytes=RESULT_CACHE_BYTES)
+
+        self.update_rate_helper_text(self.frequency_selector.get())
+        self.after(CHART_LOAD_DELAY_MS, self._ensure_chart)
+
+    def _ensure_chart(self):
+        if self.chart is not None:
+            return self.chart
+        import matplotlib
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import chart
+
+        chart.set_matplotlib_font()
+        matplotlib.use("TkAgg")
+
+        def canvas_factory(fig):
+            canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
+            canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew")
+            return canvas
+
+        self.chart_loading_label.destroy()
+        self.chart = chart.GrowthChart(canvas_factory, self._get_plot_colors)
+        self.chart.setup_initial_plot()
+        return self.chart
+
+    def _get_plot_colors(self):
+        if ctk.get_appearance_mode() == "Dark":
+            return {"bg_color": "#2b2b2b", "text_color": "#dce4ee", "spine_color": "#565b5e", "grid_color": "#343638", "line_color": "#1f77b4", "annot_bg": "#3c3f41", "annot_text": "white"}
+        else:
+            return {"bg_color": "#f0f0f0", "text_color": "#1c1c1c", "spine_color": "#565b5e", "grid_color": "#d6d6d6", "line_color": "#1f77b4", "annot_bg": "white", "annot_text": "black"}
+
+    def _read_input(self, **overrides):
+        # 读取表单; overrides 可替换 principal / rate / duration 的原始文本 (目标求解时用占位值)
+        values = {
+            "principal": self.principal_entry.get(),
+            "rate": self.rate_entry.get(),
+            "duration": self.duration_value_entry.get(),
+        }
+        values.update(overrides)
+        return engine.make_input(
+            values["principal"],
+            values["rate"],
+            self.frequency_selector.get(),
+            values["duration"],
+            self.duration_unit_selector.get(),
+            contribution_amount=self.contribution_entry.get() or 0,
+            contribution_unit=CONTRIBUTION_CADENCES[self.contribution_cadence_selector.get()],
+            contribution_start_day=self.contribution_start_entry.get() or 0,
+            contribution_end_day=self.contribution_end_entry.get() or None,
+            step_up_percent=self.step_up_entry.get() or 0,
+        )
+
+    def _read_simulation_options(self):
+        # 固定收益率模式返回 None; 否则返回 montecarlo.simulate 的关键字参数
+        distribution = RETURN_MODES[self.return_mode_selector.get()]
+        if distribution is None:
+            return None
+        if distribution == "bootstrap" and self.return_history is None:
+            raise engine.InputError("历史数据模式需要先选择收益率 CSV 文件。")
+        volatility = float(self.volatility_entry.get() or 0)
+        paths = int(self.paths_entry.get() or montecarlo.DEFAULT_PATHS)
+        if paths < 1 or volatility < 0:
+            raise engine.InputError("路径数必须为正整数，且波动率不能为负数。")
+        if paths > montecarlo.MAX_PATHS:
+            raise engine.InputError(f"路径数不能超过 {montecarlo.MAX_PATHS:,}。")
+        return {"volatility_percent": volatility, "paths": paths, "distribution": distribution,
+                "history": self.return_history, "seed": MONTE_CARLO_SEED}
+
+    def on_return_mode_change(self, selection):
+        if RETURN_MODES[selection] != "bootstrap":
+            return
+        path = filedialog.askopenfilename(title="选择历史收益率 CSV (%/期)", filetypes=[("CSV", "*.csv"), ("所有文件", "*.*")])
+        if not path:
+            if self.return_history is None:
+                self.return_mode_selector.set("固定收益率")
+            return
+        try:
+            self.return_history = montecarlo.load_returns_csv(path)
+        except (OSError, engine.InputError) as e:
+            messagebox.showerror("读取失败", str(e))
+            self.return_mode_selector.set("固定收益率")
+
+    def calculate(self):
+        try:
+            inp = self._read_input()
+            simulation_options = self._read_simulation_options()
+        except engine.InputError as e:
+            messagebox.showerror("输入错误", str(e))
+            return
+        except ValueError:
+            messagebox.showerror("输入错误", "请输入有效的数字！")
+            return
+        self._start_job(inp, simulation_options)
+
+    def goal_seek(self):
+        # 求出所选一项后写回表单, 并直接用求解结果计算 (避免写回时的舍入导致略低于目标)
+        field = GOAL_SEEK_FIELDS[self.goal_field_selector.get()]
+        try:
+            inp = self._read_input(**{field: 1})
+            simulation_options = self._read_simulation_options()
+            solved = solver.solve(inp, self.goal_entry.get(), field)
+        except engine.InputError as e:
+            messagebox.showerror("无法求解", str(e))
+            return
+        except ValueError:
+            messagebox.showerror("输入错误", "请输入有效的数字！")
+            return
+
+        if field == "principal":
+            entry, text = self.principal_entry, f"{solved.principal:.2f}"
+        elif field == "rate":
+            entry, text = self.rate_entry, f"{solved.rate_percent:.6g}"
+        else:
+            unit_days = engine.UNIT_TO_DAYS[self.duration_unit_selector.get()]
+            entry, text = self.duration_value_entry, f"{solved.total_days / unit_days:.6g}"
+        entry.delete(0, "end")
+        entry.insert(0, text)
+        self._start_job(solved, simulation_options)
+
+    def _start_job(self, inp, simulation_options=None):
+        if self._job is not None:
+            self._job.cancel()
+        if self._grid_job is not None:
+            self._grid_job.cancel()
+            self._grid_job = None
+        job = CalculationJob()
+        heatmap = self.chart_view_selector.get() == "热力图"
+        job.future = self._executor.submit(self._compute, inp, job, simulation_options, heatmap)
+        self._job = job
+        self.calculate_button.configure(text="计算中... (点击可用新输入重新计算)")
+        self.progress_bar.grid()
+        self.progress_bar.configure(mode="indeterminate")
+        self.progress_bar.start()
+        self.after(POLL_INTERVAL_MS, self._poll_job, job)
+
+    def _compute(self, inp, job, simulation_options=None, heatmap=False):
+        # 在工作线程中运行, 不能访问任何 Tk 组件 (结果缓存自带锁)
+        # 蒙特卡洛模拟每完成一块路径报告一次进度, 取消时由 job.report 中止
+        # 当前为热力图视图时一并构建敏感性网格, 否则等切换到热力图时再另起任务
+        result = engine.calculate(inp, cache=self.result_cache)
+        simulation = None
+        if simulation_options is not None:
+            simulation = montecarlo.simulate(inp, progress=job.report, **simulation_options)
+        grid = sweep.rate_duration_grid(inp) if heatmap else None
+        job.report(1.0)
+        return inp, result.projection, result.formatted, simulation, grid
+
+    def _poll_job(self, job):
+        if job is not self._job:
+            return
+        if not job.future.done():
+            if job.progress is not None:
+                if self.progress_bar.cget("mode") != "determinate":
+                    self.progress_bar.stop()
+                    self.progress_bar.configure(mode="determinate")
+                self.progress_bar.set(job.progress)
+            self.after(POLL_INTERVAL_MS, self._poll_job, job)
+            return
+
+        self._job = None
+        self.progress_bar.stop()
+        self.progress_bar.grid_remove()
+        self.calculate_button.configure(text="计算并生成图表")
+        try:
+            inp, projection, (formatted_amount, formatted_interest, formatted_rate, formatted_invested), simulation, grid = job.future.result()
+            self.plot_data = projection
+            self.last_input = inp
+            self.heatmap_grid = grid
+            if projection.depletion_day is not None:
+                formatted_amount += f"\n(第 {projection.depletion_day:,.0f} 天取完)"
+            self.total_amount_label.configure(text=formatted_amount)
+            self.total_interest_label.configure(text=formatted_interest)
+            self.return_rate_label.configure(text=formatted_rate)
+            self.total_invested_label.configure(text=formatted_invested)
+            self.simulation_label.configure(text=self._format_simulation(simulation))
+            chart = self._ensure_chart()
+            chart.set_projection(projection)
+            chart.set_simulation(simulation)
+            self.update_plot()
+        except engine.CalculationCancelled:
+            pass
+        except Exception as e:
+            messagebox.showerror("计算错误", f"发生未知错误: {e}")
+
+    def _format_simulation(self, simulation):
+        if simulation is None:
+            return "未启用"
+        finals = simulation.bands[:, -1]
+        low, high = simulation.percentiles[0], simulation.percentiles[-1]
+        return (f"中位数 ¥ {engine.format_number(simulation.median[-1])}\n"
+                f"P{low:g}–P{high:g}: ¥ {engine.format_number(finals[0])} – ¥ {engine.format_number(finals[-1])}")
+
+    def export_schedule(self):
+        # 按当前图表周期 (日/周/月/年) 每隔一个周期导出一行, 在后台线程中流式写文件
+        if self.plot_data is None:
+            messagebox.showinfo("提示", "请先点击计算生成曲线。")
+            return
+        filetypes = [("CSV", "*.csv")]
+        if export.parquet_available():
+            filetypes.append(("Parquet", "*.parquet"))
+        path = filedialog.asksaveasfilename(title="导出明细", defaultextension=".csv", filetypes=filetypes)
+        if not path:
+            return
+        step = engine.UNIT_TO_DAYS[self.chart_period_selector.get()]
+        if self._export_job is not None:
+            self._export_job.cancel()
+        job = CalculationJob()
+        job.future = self._export_executor.submit(export.export_schedule, self.plot_data, path, step, progress=job.report)
+        self._export_job = job
+        self.after(POLL_INTERVAL_MS, self._poll_export, job, path)
+
+    def _poll_export(self, job, path):
+        if job is not self._export_job:
+            return
+        if not job.future.done():
+            self.after(POLL_INTERVAL_MS, self._poll_export, job, path)
+            return
+        self._export_job = None
+        try:
+            rows = job.future.result()
+        except engine.CalculationCancelled:
+            return
+        except (OSError, engine.InputError) as e:
+            messagebox.showerror("导出失败", str(e))
+            return
+        messagebox.showinfo("导出完成", f"已写出 {rows:,} 行到 {path}")
+
+    def destroy(self):
+        if self._job is not None:
+            self._job.cancel()
+        if self._grid_job is not None:
+            self._grid_job.cancel()
+        if self._export_job is not None:
+            self._export_job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._export_executor.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
+    def update_plot(self, *args):
+        if self.chart is None:
+            return
+        period = self.chart_period_selector.get()
+        if self.chart_view_selector.get() == "热力图" and self.last_input is not None:
+            if self.heatmap_grid is not None:
+                self.chart.update_heatmap(self.heatmap_grid, period)
+            elif self._grid_job is None and self._job is None:
+                # 计算进行中时网格随计算结果一并返回; 否则在后台构建, 完成后再绘制
+                self._start_grid_job(self.last_input)
+        else:
+            self.chart.update_plot(period)
+
+    def _start_grid_job(self, inp):
+        job = CalculationJob()
+        job.future = self._executor.submit(sweep.rate_duration_grid, inp)
+        self._grid_job = job
+        self.after(POLL_INTERVAL_MS, self._poll_grid_job, job, inp)
+
+    def _poll_grid_job(self, job, inp):
+        if job is not self._grid_job:
+            return
+        if not job.future.done():
+            self.after(POLL_INTERVAL_MS, self._poll_grid_job, job, inp)
+            return
+        self._grid_job = None
+        if inp is not self.last_input:
+            return
+        try:
+            self.heatmap_grid = job.future.result()
+        except Exception as e:
+            messagebox.showerror("计算错误", f"发生未知错误: {e}")
+            return
+        self.update_plot()
+
+    def pin_scenario(self):
+        if self.chart is None or self.last_input is None:
+            messagebox.showinfo("提示", "请先点击计算生成曲线。")
+            return
+        inp = self.last_input
+        label = f"¥{inp.principal:,.0f} {inp.frequency} {inp.rate_percent:g}% {inp.total_days:g}天"
+        if inp.contribution is not None:
+            label += f" 定投¥{inp.contribution.amount:,.0f}/{inp.contribution.every_days:g}天"
+        self.chart.pin_current(label)
+        self.update_plot()
+
+    def clear_pinned_scenarios(self):
+        if self.chart is None:
+            return
+        self.chart.clear_pinned()
+        self.update_plot()
+
+    def update_rate_helper_text(self, selection):
+        text_map = {"按日": "（这是每日收益率）", "按月": "（这是每月收益率）", "按年": "（这是每年收益率）"}
+        self.rate_helper_label.configure(text=text_map.get(selection, ""))
@@ -0,0 +1,148 @@
+"""蒙特卡洛模式: 每期收益率按分布随机抽取, 按路径分块向量化模拟, 输出各时间点的分位数。不依赖任何界面库。"""
+
+import csv
+
+import numpy as np
+
+import engine
+
+__all__ = ["DISTRIBUTIONS", "DEFAULT_PATHS", "MAX_PATHS", "DEFAULT_PERCENTILES", "MonteCarloResult", "load_returns_csv",
+           "simulate"]
+
+DISTRIBUTIONS = ("normal", "lognormal", "bootstrap")
+DEFAULT_PATHS = 10_000
+# 路径数上限: 各时间点的金额按 (路径 × 时间点) 保留到最后求分位数, 最多约 100,000 × 500 × 8 B = 400 MB
+MAX_PATHS = 100_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+MAX_CHECKPOINTS = 500
+# 每块最多模拟的 路径 × 期数 个元素, 限制单块内临时数组的内存 (每个数组约 16 MB)
+CHUNK_ELEMENTS = 1 << 21
+# 单期增长倍数的下限: 正态分布可能抽到低于 -100% 的收益率, 视为几乎亏光而不是变为负数
+MIN_GROWTH = 1e-6
+
+
+class MonteCarloResult:
+    # bands 形状为 (分位数, 时间点), 行顺序与 percentiles 一致; final_amounts 为每条路径的最终金额
+    __slots__ = ("days", "percentiles", "bands", "final_amounts")
+
+    def __init__(self, days, percentiles, bands, final_amounts):
+        self.days = days
+        self.percentiles = percentiles
+        self.bands = bands
+        self.final_amounts = final_amounts
+
+    def band(self, percentile):
+        return self.bands[self.percentiles.index(percentile)]
+
+    def bands_at(self, day):
+        # 任意一天各分位数的金额, 在相邻时间点之间线性插值
+        return np.array([np.interp(day, self.days, band) for band in self.bands])
+
+    @property
+    def median(self):
+        return self.band(50)
+
+
+def load_returns_csv(path):
+    """读取历史收益率 CSV: 取每行第一个可解析为数字的单元格 (单位为 %/期), 表头与空行自动跳过。"""
+    returns = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            for cell in row:
+                try:
+                    returns.append(float(cell.strip().rstrip("%")))
+                except ValueError:
+                    continue
+                break
+    if not returns:
+        raise engine.InputError("历史收益率文件中没有可用的数字。")
+    return np.array(returns, dtype=np.float64)
+
+
+def _step_grid(inp):
+    # 按复利周期划分步长; 最后一步可能不足一个周期, 用 fractions 记录其占比
+    last_day = int(inp.total_days)
+    dpp = inp.days_per_period
+    steps = max(1, int(np.ceil(last_day / dpp)))
+    step_days = np.minimum(np.arange(1, steps + 1) * dpp, last_day)
+    fractions = np.diff(np.concatenate(([0.0], step_days))) / dpp
+    return steps, step_days, fractions
+
+
+def _deposits(inp, steps):
+    # 每一步结束时到账的定投金额: 第 t 天的投入计入覆盖该天的那一步 (t = 0 计入初始值)
+    deposits = np.zeros(steps + 1)
+    if inp.contribution is not None:
+        deposit_days, amounts = inp.contribution.schedule(int(inp.total_days))
+        index = np.ceil(deposit_days / inp.days_per_period - 1e-9).astype(np.int64)
+        deposits += np.bincount(np.minimum(index, steps), weights=amounts, minlength=steps + 1)
+    return deposits
+
+
+def _log_growth(rng, distribution, mean, sigma, history, shape):
+    # 每期增长倍数的自然对数; normal/lognormal 的期望增长倍数都约为 1 + mean
+    if distribution == "normal":
+        return np.log(np.maximum(1.0 + rng.normal(mean, sigma, shape), MIN_GROWTH))
+    if distribution == "lognormal":
+        return rng.normal(np.log1p(mean) - sigma ** 2 / 2, sigma, shape)
+    return np.log(np.maximum(1.0 + rng.choice(history, shape), MIN_GROWTH))
+
+
+def simulate(inp, volatility_percent=0.0, paths=DEFAULT_PATHS, distribution="normal", history=None,
+             seed=None, percentiles=DEFAULT_PERCENTILES, progress=None):
+    """模拟 paths 条路径, 返回 MonteCarloResult。
+
+    每期收益率的均值为 inp.rate_percent, 标准差为 volatility_percent (均为 %/期);
+    distribution 为 "bootstrap" 时从 history (历史收益率, %/期) 中有放回抽样。
+    路径按块计算, 每块内 (路径 × 期数) 的抽样、累计对数增长和定投前缀和都是整块数组运算;
+    各时间点的金额 (路径 × 最多 MAX_CHECKPOINTS 个时间点) 保留到最后求分位数, 因此 paths 不能超过 MAX_PATHS;
+    progress 为可选回调, 每完成一块以完成比例调用一次 (可抛出异常中止模拟)。
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise engine.InputError(f"未知的收益分布: {distribution}")
+    paths = int(paths)
+    volatility_percent = float(volatility_percent)
+    if paths < 1 or volatility_percent < 0:
+        raise engine.InputError("路径数必须为正整数，且波动率不能为负数。")
+    if paths > MAX_PATHS:
+        raise engine.InputError(f"路径数不能超过 {MAX_PATHS:,}。")
+    if distribution == "bootstrap":
+        if history is None or len(history) == 0:
+            raise engine.InputError("历史数据模式需要先选择收益率 CSV 文件。")
+        history = np.asarray(history, dtype=np.float64) / 100.0
+
+    rng = np.random.default_rng(seed)
+    steps, step_days, fractions = _step_grid(inp)
+    deposits = _deposits(inp, steps)
+    start = inp.principal + deposits[0]
+    checkpoints = np.unique(np.linspace(0, steps, min(steps + 1, MAX_CHECKPOINTS)).round().astype(np.int64))
+    days = np.concatenate(([0.0], step_days))[checkpoints]
+    recorded = np.empty((paths, len(checkpoints)), dtype=np.float64)
+    recorded[:, 0] = max(start, 0.0)
+    columns = checkpoints[1:] - 1
+
+    chunk = max(1, CHUNK_ELEMENTS // steps)
+    for begin in range(0, paths, chunk):
+        end = min(begin + chunk, paths)
+        # 累计对数增长 L_k; 金额 X_k = e^{L_k} * (X_0 + sum_{j<=k} D_j * e^{-L_j})
+        log_growth = _log_growth(rng, distribution, inp.rate_per_period, volatility_percent / 100.0,
+                                 history, (end - begin, steps))
+        log_growth *= fractions
+        cumulative = np.cumsum(log_growth, axis=1, out=log_growth)
+        with np.errstate(over="ignore", invalid="ignore"):
+            if deposits[1:].any():
+                funded = start + np.cumsum(deposits[1:] * np.exp(-cumulative), axis=1)
+                amounts = np.exp(cumulative[:, columns]) * funded[:, columns]
+            else:
+                amounts = start * np.exp(cumulative[:, columns])
+        if inp.contribution is not None and inp.contribution.amount < 0:
+            # 与 engine.Projection 一致, 取完后金额为 0: funded 随取出单调减小, 不为正即已取完
+            np.maximum(amounts, 0.0, out=amounts)
+        recorded[begin:end, 1:] = amounts
+        if progress is not None:
+            progress(end / paths)
+
+    final_amounts = recorded[:, -1].copy()
+    # 原地部分排序求分位数, 不再复制一份 (路径 × 时间点) 的数组
+    bands = np.percentile(recorded, percentiles, axis=0, overwrite_input=True)
+    return MonteCarloResult(days, tuple(percentiles), bands, final_amounts)
@@ -0,0 +1,425 @@
+"""本地 HTTP/JSON 服务: asyncio 前端接收请求, 计算交给进程池, 只监听 127.0.0.1。不导入任何界面库。
+
+接口 (请求与响应均为 JSON):
+  POST /project  单个场景, 字段同批处理 CSV 列 (principal, rate, frequency, duration, unit, 可选定投列),
+                 可选 points > 0 时附带等间隔采样的曲线
+  POST /batch    {"scenarios": [场景, ...]}, 单个场景出错时在对应位置返回 {"error": ...}
+  POST /sweep    {"principals", "rates", "frequencies", "durations", "unit"} 网格扫描
+  GET  /metrics  各接口的请求数、错误数、延迟分位数与吞吐量, 以及合并/批处理统计
+  GET  /health
+
+短时间内到达的单场景请求先攒成一批再提交给进程池 (每批一次进程间往返);
+尚未返回的相同场景共用同一个结果, 不重复计算。
+"""
+
+import asyncio
+import collections
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+import batch
+import engine
+import sweep
+from cache import LRUCache
+
+__all__ = ["HOST", "DEFAULT_PORT", "ProjectionService", "serve", "run_server"]
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 攒批窗口与单批上限: 窗口内到达的单场景请求合并为一个进程池任务
+BATCH_WINDOW_S = 0.002
+MAX_BATCH = 256
+MAX_BATCH_ITEMS = 10_000
+MAX_SWEEP_CELLS = 100_000
+MAX_POINTS = 10_000
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# 每个接口保留最近这么多次请求的延迟用于计算分位数
+LATENCY_WINDOW = 10_000
+ENDPOINTS = ("/project", "/batch", "/sweep", "/metrics", "/health")
+WORKER_CACHE_MB = 64
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- 以下函数在工作进程中执行 ---
+
+_worker_cache = None
+
+
+def _finite(value):
+    # JSON 不支持 inf/NaN, 统一写为 null
+    return value if value is not None and math.isfinite(value) else None
+
+
+def _summary_json(summary):
+    return {
+        "final_amount": _finite(summary.final_amount),
+        "total_interest": _finite(summary.total_interest),
+        "return_rate": _finite(summary.return_rate),
+        "total_invested": _finite(summary.total_invested),
+        "log_final_amount": _finite(summary.log_final_amount),
+    }
+
+
+def _evaluate(inp, points):
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = LRUCache(max_bytes=WORKER_CACHE_MB * 1024 * 1024)
+    result = engine.calculate(inp, cache=_worker_cache)
+    payload = _summary_json(result.summary)
+    if points:
+        projection = result.projection
+        days = np.unique(np.linspace(0, projection.last_day, min(points, len(projection))).round())
+        payload["curve"] = {"days": days.astype(int).tolist(), "amounts": _json_array(projection.amounts_at(days))}
+    return payload
+
+
+def _evaluate_many(requests):
+    # 一批 (ProjectionInput, points) 只占用一次进程间往返; 单个场景出错时在其位置返回异常对象,
+    # 不影响同批的其他场景
+    results = []
+    for inp, points in requests:
+        try:
+            results.append(_evaluate(inp, points))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _json_array(values):
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def _sweep(axes):
+    result = sweep.sweep(*axes, workers=1)
+    payload = {
+        "principals": result.principals.tolist(),
+        "rates": result.rates.tolist(),
+        "frequencies": result.frequencies,
+        "durations": result.durations.tolist(),
+        "unit": result.duration_unit,
+    }
+    for i, field in enumerate(sweep.FIELDS):
+        payload[field] = _json_array(result.values[..., i])
+    return payload
+
+
+# --- 请求解析 ---
+
+def parse_scenario(obj):
+    # 字段名与取值别名同批处理 CSV; 数值可以是 JSON 数字或字符串
+    if not isinstance(obj, dict):
+        raise engine.InputError("场景必须是 JSON 对象。")
+    row = {key: "" if value is None else str(value) for key, value in obj.items()}
+    try:
+        return batch.parse_row(row)
+    except engine.InputError:
+        raise
+    except ValueError:
+        raise engine.InputError("请输入有效的数字！") from None
+
+
+def _parse_points(obj):
+    try:
+        points = int(obj.get("points") or 0)
+    except (TypeError, ValueError):
+        raise engine.InputError("points 必须为整数。") from None
+    if not 0 <= points <= MAX_POINTS:
+        raise engine.InputError(f"points 必须在 0 ~ {MAX_POINTS} 之间。")
+    return points
+
+
+def _parse_sweep(obj):
+    if not isinstance(obj, dict):
+        raise engine.InputError("请求体必须是 JSON 对象。")
+    missing = [key for key in ("principals", "rates", "frequencies", "durations") if not obj.get(key)]
+    if missing:
+        raise engine.InputError(f"缺少字段或为空: {', '.join(missing)}")
+    if not isinstance(obj["frequencies"], list):
+        raise engine.InputError("frequencies 必须是列表。")
+    frequencies = [batch.FREQUENCY_ALIASES.get(str(f).lower(), str(f)) for f in obj["frequencies"]]
+    unit = str(obj.get("unit") or "年")
+    unit = batch.UNIT_ALIASES.get(unit.lower(), unit)
+    try:
+        axes = [np.asarray(obj[key], dtype=np.float64).ravel() for key in ("principals", "rates", "durations")]
+    except (TypeError, ValueError):
+        raise engine.InputError("请输入有效的数字！") from None
+    cells = len(axes[0]) * len(axes[1]) * len(frequencies) * len(axes[2])
+    if cells > MAX_SWEEP_CELLS:
+        raise engine.InputError(f"网格共 {cells} 格, 超过上限 {MAX_SWEEP_CELLS}。")
+    return axes[0], axes[1], frequencies, axes[2], unit
+
+
+# --- 指标 ---
+
+class EndpointMetrics:
+    __slots__ = ("requests", "errors", "latencies")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def snapshot(self, uptime):
+        latencies = np.array(self.latencies) * 1e3
+        percentiles = np.percentile(latencies, (50, 95, 99)).tolist() if len(latencies) else [None] * 3
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": self.requests / uptime if uptime > 0 else 0.0,
+            "latency_ms": dict(zip(("p50", "p95", "p99"), percentiles)),
+        }
+
+
+class ProjectionService:
+    """请求处理与调度: 单场景攒批与合并、批量与扫描分派到进程池、收集指标。"""
+
+    def __init__(self, workers=None, batch_window=BATCH_WINDOW_S, max_batch=MAX_BATCH):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.started = time.monotonic()
+        self.metrics = collections.defaultdict(EndpointMetrics)
+        self.coalesced = 0
+        self.scenarios = 0
+        self.batches = 0
+        # 已提交但尚未返回结果的场景 -> Future; 相同场景直接共用
+        self._pending = {}
+        self._queue = []
+        self._flush_handle = None
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    # 单场景的攒批与合并
+
+    async def evaluate(self, inp, points=0):
+        key = (inp, points)
+        self.scenarios += 1
+        future = self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            self._queue.append(key)
+            if len(self._queue) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        # shield: 某个等待方断开时不取消其他请求共用的结果
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        keys, self._queue = self._queue, []
+        if not keys:
+            return
+        self.batches += 1
+        task = asyncio.get_running_loop().run_in_executor(self.executor, _evaluate_many, keys)
+        task.add_done_callback(lambda done: self._resolve(keys, done))
+
+    def _resolve(self, keys, done):
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        for i, key in enumerate(keys):
+            future = self._pending.pop(key)
+            if future.done():
+                continue
+            result = error if error is not None else done.result()[i]
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    # 各接口
+
+    async def project(self, body):
+        if not isinstance(body, dict):
+            raise engine.InputError("请求体必须是 JSON 对象。")
+        return await self.evaluate(parse_scenario(body), _parse_points(body))
+
+    async def batch(self, body):
+        scenarios = body.get("scenarios") if isinstance(body, dict) else None
+        if not isinstance(scenarios, list):
+            raise engine.InputError("请求体必须包含 scenarios 列表。")
+        if len(scenarios) > MAX_BATCH_ITEMS:
+            raise engine.InputError(f"单次最多 {MAX_BATCH_ITEMS} 个场景。")
+
+        async def one(obj):
+            try:
+                return await self.evaluate(parse_scenario(obj), _parse_points(obj))
+            except engine.InputError as e:
+                return {"error": str(e)}
+            except Exception as e:
+                return {"error": f"{type(e).__name__}: {e}"}
+
+        return {"results": await asyncio.gather(*(one(obj) for obj in scenarios))}
+
+    async def sweep(self, body):
+        axes = _parse_sweep(body)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _sweep, axes)
+
+    def snapshot(self):
+        uptime = time.monotonic() - self.started
+        return {
+            "uptime_s": uptime,
+            "workers": self.workers,
+            "endpoints": {path: metrics.snapshot(uptime) for path, metrics in sorted(self.metrics.items())},
+            "scenarios": self.scenarios,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "mean_batch_size": (self.scenarios - self.coalesced) / self.batches if self.batches else 0.0,
+        }
+
+    # HTTP 路由
+
+    async def dispatch(self, method, path, body):
+        routes = {
+            "/project": ("POST", self.project),
+            "/batch": ("POST", self.batch),
+            "/sweep": ("POST", self.sweep),
+        }
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/metrics":
+            return self.snapshot()
+        if path not in routes:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"未知的接口: {path}")
+        expected, handler = routes[path]
+        if method != expected:
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"{path} 只接受 {expected} 请求。")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "请求体不是有效的 JSON。") from None
+        return await handler(payload)
+
+    async def handle(self, method, path, body):
+        # 返回 (状态码, 响应体字节); 每个请求都记入对应接口的指标
+        start = time.perf_counter()
+        # 未知路径统一记在 "other" 下, 避免指标表随任意路径增长
+        metrics = self.metrics[path if path in ENDPOINTS else "other"]
+        metrics.requests += 1
+        try:
+            status, payload = HTTPStatus.OK, await self.dispatch(method, path, body)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except engine.InputError as e:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+        try:
+            response = _encode(payload)
+        except (TypeError, ValueError) as e:
+            # 响应中混入 inf/NaN 或无法序列化的对象: 返回 500, 而不是在写响应时断开连接
+            status, response = HTTPStatus.INTERNAL_SERVER_ERROR, _encode({"error": f"响应无法序列化为 JSON: {e}"})
+        if status != HTTPStatus.OK:
+            metrics.errors += 1
+        metrics.latencies.append(time.perf_counter() - start)
+        return status, response
+
+
+# --- HTTP/1.1 (仅实现本服务需要的子集: Content-Length 请求体与 keep-alive) ---
+
+async def _read_request(reader):
+    # 返回 (方法, 路径, 请求头, 请求体); 连接已关闭时返回 None
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "请求行格式错误。") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Content-Length 无效。")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "请求体过大。")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _write_response(writer, status, body, keep_alive):
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except RequestError as e:
+                _write_response(writer, e.status, _encode({"error": str(e)}), keep_alive=False)
+                break
+            if request is None:
+                break
+            method, path, headers, body = request
+            keep_alive = headers.get("connection", "").lower() != "close"
+            status, response = await service.handle(method, path, body)
+            _write_response(writer, status, response, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(port=DEFAULT_PORT, workers=None, ready=None):
+    """在 127.0.0.1:port 上运行服务直到被取消; ready 为可选回调, 监听开始后以实际端口调用一次。"""
+    service = ProjectionService(workers)
+    server = await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), HOST, port)
+    try:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def run_server(port=DEFAULT_PORT, workers=None):
+    # 命令行入口: Ctrl+C 退出; 返回值用作进程退出码
+    def ready(actual_port):
+        print(f"服务已启动: http://{HOST}:{actual_port} (工作进程 {workers or os.cpu_count() or 1} 个)",
+              file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(port, workers, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,148 @@
+"""目标求解: 给定目标本息总额, 反求本金、收益率或时长中的一项。不依赖任何界面库。
+
+无定投时三项都有闭式解 (对数反解); 有定投时本金仍是线性关系,
+收益率用带区间保护的牛顿法 (对数尺度) 求根, 时长在逐步扩大的天数区间上向量化查找首个达标日。
+"""
+
+from dataclasses import replace
+
+import numpy as np
+
+import engine
+
+__all__ = ["FIELDS", "MAX_DURATION_DAYS", "solve", "solve_principal", "solve_rate", "solve_duration"]
+
+FIELDS = ("principal", "rate", "duration")
+MAX_DURATION_DAYS = 1000 * 365
+MAX_ITERATIONS = 200
+RATE_TOLERANCE = 1e-12
+
+
+def _log_growth(inp):
+    # 单位本金在最后一天的增长倍数的自然对数; 增长倍数本身可能超出浮点范围
+    return int(inp.total_days) / inp.days_per_period * np.log1p(inp.rate_per_period)
+
+
+def solve_principal(inp, target):
+    # 最终金额 = 本金 * 增长倍数 + 定投部分, 对本金是线性的; 在对数空间相除, 增长倍数溢出时仍可求解
+    contributed = 0.0
+    if inp.contribution is not None:
+        # 本金为 0 时定期取出会立即取完 (金额截为 0); 定投部分对金额是线性的, 按存入计算后再取符号
+        sign = float(np.sign(inp.contribution.amount))
+        deposits = replace(inp, principal=0.0, contribution=inp.contribution.scaled(sign))
+        contributed = sign * engine.run(deposits).final_amount
+    remaining = target - contributed
+    if not remaining >= 0:
+        raise engine.InputError("仅靠定投已超过目标金额, 无需初始本金。")
+    with np.errstate(divide="ignore", under="ignore"):
+        principal = np.exp(np.log(remaining) - _log_growth(inp))
+    if remaining > 0 and principal == 0:
+        raise engine.InputError("增长倍数过大, 所需本金小于可表示的最小金额。")
+    return replace(inp, principal=float(principal))
+
+
+def solve_rate(inp, target):
+    last_day = int(inp.total_days)
+    if last_day <= 0:
+        raise engine.InputError("时长不足一天, 无法求解收益率。")
+    if inp.contribution is None:
+        if inp.principal <= 0:
+            raise engine.InputError("本金为 0 且没有定投, 任何收益率都无法达到目标。")
+        if target < inp.principal:
+            raise engine.InputError("目标金额低于本金, 无需正收益率。")
+        with np.errstate(over="ignore"):
+            rate = np.expm1(inp.days_per_period / last_day * (np.log(target) - np.log(inp.principal)))
+        if not np.isfinite(rate):
+            raise engine.InputError("目标金额过大, 无法求解收益率。")
+        return replace(inp, rate_percent=float(rate) * 100)
+
+    # 最终金额 f(r) = P * g ** e_0 + sum(a_k * g ** e_k), g = 1 + r, e 为各笔资金的复利期数
+    deposit_days, amounts = inp.contribution.schedule(last_day)
+    weights = np.append(inp.principal, amounts)
+    exponents = np.append(last_day, last_day - deposit_days) / inp.days_per_period
+
+    def f(rate):
+        # 在对数尺度上求根: log(f(r) / target) 近似线性, 牛顿法几步即可收敛
+        # 取出导致金额不为正时视为低于目标
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            powers = np.power(1.0 + rate, exponents - 1.0)
+            value = float(np.dot(weights, powers * (1.0 + rate)))
+            slope = float(np.dot(weights * exponents, powers))
+            if value <= 0:
+                return -np.inf, np.nan
+            return float(np.log(value / target)), slope / value
+
+    low, high = 0.0, 1.0
+    if f(low)[0] > 0:
+        raise engine.InputError("本金与定投无需收益即可超过目标金额。")
+    while f(high)[0] < 0:
+        low, high = high, high * 2
+        if high > 1e6:
+            raise engine.InputError("目标金额过大, 无法求解收益率。")
+
+    # 牛顿步落在区间外, 或没能把误差减半 (指数曲线远端牛顿法收敛很慢) 时改用二分,
+    # 保证始终在 [low, high] 内收敛
+    rate = (low + high) / 2
+    previous_step = high - low
+    for _ in range(MAX_ITERATIONS):
+        value, slope = f(rate)
+        if value == 0:
+            break
+        if value < 0:
+            low = rate
+        else:
+            high = rate
+        candidate = rate - value / slope if slope > 0 and np.isfinite(slope) else np.nan
+        if not (low < candidate < high) or abs(2 * value) > abs(previous_step * slope):
+            candidate = (low + high) / 2
+        previous_step = candidate - rate
+        rate = candidate
+        if abs(previous_step) <= RATE_TOLERANCE * max(1.0, rate):
+            break
+    return replace(inp, rate_percent=float(rate) * 100)
+
+
+def solve_duration(inp, target):
+    # 返回达到目标的最早整数天 (至少 1 天)
+    if inp.contribution is None:
+        if inp.principal <= 0 or inp.rate_per_period <= 0:
+            if target <= inp.principal:
+                return replace(inp, total_days=1.0)
+            raise engine.InputError("本金或收益率为 0 且没有定投, 金额不会增长。")
+        periods = np.log(target / inp.principal) / np.log1p(inp.rate_per_period)
+        day = max(1, int(np.ceil(periods * inp.days_per_period)))
+        # 浮点舍入可能差一天, 用正向计算校正
+        projection = engine.project(inp.principal, inp.rate_per_period, inp.days_per_period, day + 1)
+        if day > 1 and projection.amount_at(day - 1) >= target:
+            day -= 1
+        elif projection.amount_at(day) < target:
+            day += 1
+        if day > MAX_DURATION_DAYS:
+            raise engine.InputError("1000 年内无法达到目标金额。")
+        return replace(inp, total_days=float(day))
+
+    # 有定投时金额随天数跳变, 在逐步扩大的区间上一次性计算每一天并找出首个达标日
+    horizon = 365
+    while True:
+        projection = engine.project(inp.principal, inp.rate_per_period, inp.days_per_period, horizon,
+                                    inp.contribution)
+        reached = np.flatnonzero(projection.amounts_at(np.arange(horizon + 1)) >= target)
+        if len(reached):
+            return replace(inp, total_days=float(max(1, reached[0])))
+        if horizon >= MAX_DURATION_DAYS:
+            raise engine.InputError("1000 年内无法达到目标金额。")
+        horizon = min(horizon * 4, MAX_DURATION_DAYS)
+
+
+def solve(inp, target, field):
+    """求解 field (FIELDS 之一), 返回填入求解结果的新 ProjectionInput; 无解时抛出 InputError。"""
+    target = float(target)
+    if not np.isfinite(target) or target <= 0:
+        raise engine.InputError("目标金额必须为正数。")
+    if field == "principal":
+        return solve_principal(inp, target)
+    if field == "rate":
+        return solve_rate(inp, target)
+    if field == "duration":
+        return solve_duration(inp, target)
+    raise ValueError(f"未知的求解项: {field}")
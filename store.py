@@ -0,0 +1,55 @@
+"""扫描结果的内存映射存储: 文件头为 JSON (网格各轴、形状、数据类型), 其后是按 C 顺序排列的定长数组。
+
+写入方与各工作进程以 r+ 模式映射同一文件并原地填充, 读取方以只读模式映射, 均不拷贝数据。
+"""
+
+import json
+import struct
+
+import numpy as np
+
+__all__ = ["MAGIC", "DTYPE", "create", "read_header", "open_values"]
+
+MAGIC = b"CICSTORE"
+VERSION = 1
+DTYPE = np.dtype("<f8")
+# 数据区按 64 字节对齐, 方便按行/块映射
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sII")
+
+
+def create(path, shape, axes, fields, duration_unit):
+    """写入文件头并分配数据区 (稀疏文件, 未写入的部分读出为 0), 返回可写的内存映射数组。"""
+    header = json.dumps({
+        "shape": list(shape),
+        "dtype": DTYPE.str,
+        "fields": list(fields),
+        "duration_unit": duration_unit,
+        "axes": {name: np.asarray(values).tolist() for name, values in axes.items()},
+    }, ensure_ascii=False).encode("utf-8")
+    offset = -(-(_PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * (offset - _PREFIX.size - len(header)))
+        f.truncate(offset + int(np.prod(shape)) * DTYPE.itemsize)
+    return np.memmap(path, dtype=DTYPE, mode="r+", offset=offset, shape=tuple(shape))
+
+
+def read_header(path):
+    """返回 (文件头字典, 数据区偏移)。"""
+    with open(path, "rb") as f:
+        magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"不是有效的结果文件: {path}")
+        header = json.loads(f.read(length).decode("utf-8"))
+    offset = -(-(_PREFIX.size + length) // ALIGNMENT) * ALIGNMENT
+    return header, offset
+
+
+def open_values(path, mode="r"):
+    """映射数据区, 返回 (文件头字典, 数组); mode 为 "r" (只读) 或 "r+" (原地写入)。"""
+    header, offset = read_header(path)
+    values = np.memmap(path, dtype=np.dtype(header["dtype"]), mode=mode, offset=offset,
+                       shape=tuple(header["shape"]))
+    return header, values
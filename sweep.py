@@ -0,0 +1,328 @@
+"""参数扫描: 对 本金 × 利率 × 复利频率 × 时长 的笛卡尔网格向量化求值, 结果为稠密 NumPy 数组。
+
+超出内存的网格可写入内存映射结果文件 (见 store.py): 工作进程原地填充, 之后用 load() 零拷贝打开。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import engine
+import store
+
+__all__ = ["FIELDS", "SweepResult", "RateDurationGrid", "grid_range", "growth_factors", "scale_factors",
+           "evaluate_block", "sweep", "load", "rate_duration_grid"]
+
+FIELDS = ("final_amount", "total_interest", "return_rate")
+DEFAULT_CHUNK_SIZE = 1 << 18
+HEATMAP_SIZE = 200
+
+
+class SweepResult:
+    # values 形状为 (本金, 利率, 频率, 时长, 3), 最后一维依次为 FIELDS
+    __slots__ = ("principals", "rates", "frequencies", "durations", "duration_unit", "values")
+
+    def __init__(self, principals, rates, frequencies, durations, duration_unit, values):
+        self.principals = principals
+        self.rates = rates
+        self.frequencies = frequencies
+        self.durations = durations
+        self.duration_unit = duration_unit
+        self.values = values
+
+    @property
+    def shape(self):
+        return self.values.shape[:-1]
+
+    @property
+    def final_amount(self):
+        return self.values[..., 0]
+
+    @property
+    def total_interest(self):
+        return self.values[..., 1]
+
+    @property
+    def return_rate(self):
+        return self.values[..., 2]
+
+
+def grid_range(start, stop, num):
+    # 闭区间等分, 便于构造扫描轴
+    return np.linspace(start, stop, int(num))
+
+
+def _axes(principals, rates, frequencies, durations, duration_unit):
+    principals = np.atleast_1d(np.asarray(principals, dtype=np.float64))
+    rates = np.atleast_1d(np.asarray(rates, dtype=np.float64))
+    durations = np.atleast_1d(np.asarray(durations, dtype=np.float64))
+    frequencies = list(frequencies)
+    unknown = [f for f in frequencies if f not in engine.FREQ_TO_DAYS]
+    if unknown:
+        raise engine.InputError(f"未知的复利频率: {', '.join(unknown)}")
+    if duration_unit not in engine.UNIT_TO_DAYS:
+        raise engine.InputError(f"未知的时长单位: {duration_unit}")
+    if not (np.isfinite(principals).all() and np.isfinite(rates).all() and np.isfinite(durations).all()):
+        raise engine.InputError("请输入有效的数字！")
+    if (principals < 0).any() or (rates < 0).any() or (durations <= 0).any():
+        raise engine.InputError("本金、利率必须为正数，且时长必须大于0。")
+    return principals, rates, frequencies, durations
+
+
+def growth_factors(rates_percent, days_per_period, last_days):
+    # 单位本金的最终增长倍数 (1 + r) ** (last_day / days_per_period), 与本金无关
+    growth = 1.0 + np.asarray(rates_percent, dtype=np.float64) / 100.0
+    periods = np.asarray(last_days, dtype=np.float64) / np.asarray(days_per_period, dtype=np.float64)
+    with np.errstate(over="ignore"):
+        return np.power(growth, periods)
+
+
+def scale_factors(principals, factors, out=None):
+    # 由增长倍数按本金缩放出 FIELDS; 总收益率只取决于增长倍数
+    principals = np.asarray(principals, dtype=np.float64)
+    factors = np.asarray(factors, dtype=np.float64)
+    shape = np.broadcast_shapes(principals.shape, factors.shape)
+    if out is None:
+        out = np.empty(shape + (len(FIELDS),), dtype=np.float64)
+    with np.errstate(over="ignore", invalid="ignore"):
+        np.multiply(principals, factors, out=out[..., 0])
+        np.subtract(out[..., 0], principals, out=out[..., 1])
+        out[..., 2] = np.where(principals > 0, (factors - 1.0) * 100, np.nan)
+    return out
+
+
+def evaluate_block(principals, rates_percent, days_per_period, last_days, out=None):
+    # 广播求值: 各参数可为任意可广播形状的数组, 结果最后一维为 FIELDS
+    # 与 engine.Projection 一致: 最终金额 = principal * (1 + r) ** (last_day / days_per_period)
+    # 幂运算只在 利率/频率/天数 的广播形状上做一次, 再与本金相乘
+    return scale_factors(principals, growth_factors(rates_percent, days_per_period, last_days), out)
+
+
+# 工作进程内的只读输入, 由进程池的 initializer 设置一次, 避免每个块重复序列化
+_worker_principals = None
+_worker_factors = None
+
+
+def _init_worker(principals, factors):
+    global _worker_principals, _worker_factors
+    _worker_principals = principals
+    _worker_factors = factors
+
+
+def _fill_flat(path, start, stop, principals=None, factors=None):
+    # 映射结果文件并把 [start, stop) 区间的结果原地写入, 不回传数组
+    principals = _worker_principals if principals is None else principals
+    factors = _worker_factors if factors is None else factors
+    _, values = store.open_values(path, mode="r+")
+    flat = values.reshape(-1, len(FIELDS))
+    p, rest = np.divmod(np.arange(start, stop), len(factors))
+    scale_factors(principals[p], factors[rest], out=flat[start:stop])
+    values.flush()
+
+
+def _sweep_to_store(path, principals, rates, frequencies, durations, duration_unit, factors,
+                    workers, chunk_size):
+    shape = (len(principals), len(rates), len(frequencies), len(durations))
+    axes = {"principals": principals, "rates": rates, "frequencies": frequencies, "durations": durations}
+    values = store.create(path, shape + (len(FIELDS),), axes, FIELDS, duration_unit)
+    del values
+    total = int(np.prod(shape))
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+    if len(bounds) == 1 or workers == 1:
+        for start, stop in bounds:
+            _fill_flat(path, start, stop, principals, factors)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(principals, factors)) as executor:
+            for future in [executor.submit(_fill_flat, path, start, stop) for start, stop in bounds]:
+                future.result()
+    return load(path)
+
+
+def load(path, mode="r"):
+    """打开 sweep(..., out=path) 写出的结果文件, 返回 values 为内存映射数组 (零拷贝) 的 SweepResult。"""
+    header, values = store.open_values(path, mode)
+    if tuple(header["fields"]) != FIELDS:
+        raise ValueError(f"结果文件的字段与扫描结果不一致: {path}")
+    axes = header["axes"]
+    return SweepResult(np.array(axes["principals"], dtype=np.float64), np.array(axes["rates"], dtype=np.float64),
+                       list(axes["frequencies"]), np.array(axes["durations"], dtype=np.float64),
+                       header["duration_unit"], values)
+
+
+def sweep(principals, rates, frequencies, durations, duration_unit="年",
+          workers=None, chunk_size=DEFAULT_CHUNK_SIZE, out=None):
+    """在 本金 × 利率(%) × 频率 × 时长 网格上计算最终金额、总收益与总收益率。
+
+    幂运算只在 利率 × 频率 × 时长 上做一次, 其余只是按本金缩放, 因此结果留在内存中时
+    总是在当前进程内一次广播计算 (分给进程池只会增加回传结果的开销)。
+    本金为 0 的格子总收益率为 NaN (对应界面上的 N/A)。
+    out 为文件路径时结果写入内存映射文件, 按 chunk_size 分块, 各块 (workers 大于 1 时在进程池中)
+    直接写入文件而不经由父进程, 返回的 SweepResult.values 为该文件的只读映射; 内存占用与网格大小无关。
+    """
+    principals, rates, frequencies, durations = _axes(principals, rates, frequencies, durations, duration_unit)
+    days_per_period = np.array([engine.FREQ_TO_DAYS[f] for f in frequencies])
+    # 与 engine.make_input/project 一致: 总天数取整后作为最后一天
+    last_days = np.floor(durations * engine.UNIT_TO_DAYS[duration_unit])
+
+    if out is None:
+        values = evaluate_block(
+            principals[:, None, None, None],
+            rates[None, :, None, None],
+            days_per_period[None, None, :, None],
+            last_days[None, None, None, :],
+        )
+        return SweepResult(principals, rates, frequencies, durations, duration_unit, values)
+
+    factors = growth_factors(
+        rates[:, None, None],
+        days_per_period[None, :, None],
+        last_days[None, None, :],
+    ).ravel()
+    return _sweep_to_store(out, principals, rates, frequencies, durations, duration_unit, factors,
+                           workers or os.cpu_count() or 1, chunk_size)
+
+
+def _geometric_terms(inp, rates, counts, days):
+    # 无递增时第 d 天的定投部分是 n(d) 项等比数列之和:
+    #   a * sum(growth ** ((d - start - k * every) / days_per_period), k < n(d))
+    #   = a * growth ** ((d - start) / days_per_period) * series
+    # 返回 (每天的对数增长, d - start, series)
+    log_growth = np.log1p(rates[None, :] / 100.0) / inp.days_per_period
+    elapsed = days[:, None] - inp.contribution.start_day
+    return log_growth, elapsed, _series(counts, inp.contribution.every_days, log_growth)
+
+
+def _series(counts, every_days, log_growth):
+    # 等比数列前 n 项和 (1 - q ** n) / (1 - q), q = growth ** (-every / days_per_period) <= 1;
+    # 用 expm1 计算, 避免利率很小时的相消; 结果在 [1, n] 之间, 不会溢出
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        return np.where(
+            log_growth > 0,
+            np.expm1(-counts * every_days * log_growth) / np.expm1(-every_days * log_growth),
+            counts,
+        )
+
+
+def _scheduled(contribution, principal, days):
+    # 截至各天 (含当天) 按计划发生的投入笔数与累计投入 (本金 + 定投), 与利率无关
+    # 不经由 Projection: 定期取出在余额取完后停止, 而取完的时间与利率有关
+    deposit_days, amounts = contribution.schedule(days[-1])
+    counts = np.searchsorted(deposit_days, days, side="right")
+    deposited = np.cumsum(amounts)
+    return counts, principal + np.where(counts > 0, deposited[np.maximum(counts - 1, 0)], 0.0)
+
+
+def _log_balance(logs, contributed, amount):
+    # 本金部分与定投部分 (均为自然对数) 合并; 取出时未截断的余额不为正即已取完, 与 Projection 一致取 -inf
+    if amount > 0:
+        return np.logaddexp(logs, contributed)
+    return np.where(contributed >= logs, -np.inf, logs + np.log1p(-np.exp(contributed - logs)))
+
+
+def _step_up_grid(inp, rates, days, log=False):
+    # 有递增时金额每满一年才变化, 同一年内的各笔投入仍是等比数列: 先用闭式解求出每年折现到开始日的合计,
+    # 再在对数空间 (logaddexp) 对各年做前缀和; 第 d 天的定投部分 = 之前各年的合计 + 当年已投入部分
+    # 临时数组只有 (年数 × 利率) 与 (天数 × 利率), 与投入笔数无关
+    # log=True 时返回各格最终金额的自然对数
+    contribution = inp.contribution
+    deposit_days, amounts = contribution.schedule(days[-1])
+    every = contribution.every_days
+    years = np.floor(np.arange(len(deposit_days)) * every / 365.0)
+    first = np.flatnonzero(np.diff(years, prepend=-1.0))
+    sizes = np.diff(np.append(first, len(deposit_days)))
+    counts = np.searchsorted(deposit_days, days, side="right")[:, None]
+    year_index = np.maximum(np.searchsorted(first, counts[:, 0] - 1, side="right") - 1, 0)
+    log_growth = np.log1p(rates[None, :] / 100.0) / inp.days_per_period
+    log_amounts = np.log(np.abs(amounts[first]))[:, None]
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        # 第 k 笔 (k 从 0 起) 折现到开始日的倍数为 q ** k, log(q) = -every * 对数增长
+        blocks = (log_amounts - first[:, None] * every * log_growth
+                  + np.log(_series(sizes[:, None], every, log_growth)))
+        prefix = np.logaddexp.accumulate(blocks, axis=0)
+        previous = np.where(year_index[:, None] > 0, prefix[year_index - 1], -np.inf)
+        current = (log_amounts[year_index] - first[year_index, None] * every * log_growth
+                   + np.log(_series(counts - first[year_index, None], every, log_growth)))
+        contributed = np.where(counts > 0, np.logaddexp(previous, current), -np.inf)
+        contributed += (days[:, None] - contribution.start_day) * log_growth
+        if log:
+            logs = np.log(inp.principal) + days[:, None] * log_growth
+            return _log_balance(logs, contributed, contribution.amount)
+        principal = inp.principal * np.exp(days[:, None] * log_growth) if inp.principal else 0.0
+        return principal + np.sign(contribution.amount) * np.exp(contributed)
+
+
+def _contribution_grid(inp, rates, days):
+    # 无递增时用闭式解对整个网格广播; 有递增时按年份分段, 见 _step_up_grid
+    contribution = inp.contribution
+    values = np.empty((len(days), len(rates), len(FIELDS)), dtype=np.float64)
+    counts, invested = _scheduled(contribution, inp.principal, days)
+    counts, invested = counts[:, None], invested[:, None]
+    if contribution.step_up_percent:
+        values[..., 0] = _step_up_grid(inp, rates, days)
+    else:
+        log_growth, elapsed, series = _geometric_terms(inp, rates, counts, days)
+        with np.errstate(over="ignore", invalid="ignore"):
+            values[..., 0] = (inp.principal * np.exp(log_growth * days[:, None])
+                              + np.where(counts > 0, contribution.amount * np.exp(log_growth * elapsed) * series, 0.0))
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        np.subtract(values[..., 0], invested, out=values[..., 1])
+        values[..., 2] = np.where(invested > 0, values[..., 1] / invested * 100, np.nan)
+    if contribution.amount < 0:
+        # 与 Projection 一致, 取完后金额为 0: 余额随取出单调减小, 未截断的闭式解不为正即已取完
+        # 网格的累计投入按计划计算, 取完的格子实际取出多少无从得知, 总收益与收益率记为 NaN (N/A)
+        depleted = (counts > 0) & (values[..., 0] <= 0)
+        values[depleted] = (0.0, np.nan, np.nan)
+    return values, invested[:, 0]
+
+
+class RateDurationGrid:
+    # 敏感性网格: values 形状为 (时长, 利率, 3), 行对应 days, 列对应 rates
+    # invested 为每行 (时长) 的累计投入, 与利率无关
+    # 有格子溢出为 inf 时, log_final_amount 给出每格最终金额的自然对数, 否则为 None
+    __slots__ = ("principal", "frequency", "rates", "days", "values", "invested", "log_final_amount")
+
+    def __init__(self, principal, frequency, rates, days, values, invested, log_final_amount=None):
+        self.principal = principal
+        self.frequency = frequency
+        self.rates = rates
+        self.days = days
+        self.values = values
+        self.invested = invested
+        self.log_final_amount = log_final_amount
+
+
+def _log_grid(inp, rates, days):
+    # 在对数空间重新计算整张网格的最终金额, 只在出现溢出时调用
+    with np.errstate(divide="ignore"):
+        logs = np.log(inp.principal) + days[:, None] / inp.days_per_period * np.log1p(rates[None, :] / 100.0)
+    contribution = inp.contribution
+    if contribution is None:
+        return logs
+    if contribution.step_up_percent:
+        return _step_up_grid(inp, rates, days, log=True)
+    # 无递增时与 _contribution_grid 同一闭式解: log(|a|) + (d - start) * 对数增长 + log(series)
+    counts = _scheduled(contribution, inp.principal, days)[0][:, None]
+    log_growth, elapsed, series = _geometric_terms(inp, rates, counts, days)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        contributed = np.where(counts > 0, np.log(abs(contribution.amount)) + elapsed * log_growth + np.log(series),
+                               -np.inf)
+        return _log_balance(logs, contributed, contribution.amount)
+
+
+def rate_duration_grid(inp, size=HEATMAP_SIZE):
+    # 以当前输入为中心的 利率 × 时长 网格: 两轴均为 0 ~ 2 倍当前值, 当前输入恰好落在中间格
+    # 利率为 0 时利率轴取 0 ~ 20%; 无定投时整个网格一次广播计算
+    max_rate = inp.rate_percent * 2 if inp.rate_percent > 0 else 20.0
+    rates = np.linspace(0.0, max_rate, size + 1)
+    days = np.linspace(0.0, max(1, int(inp.total_days)) * 2.0, size + 1)
+    if inp.contribution is None:
+        values = evaluate_block(inp.principal, rates[None, :], inp.days_per_period, days[:, None])
+        invested = np.full(len(days), inp.principal)
+    else:
+        values, invested = _contribution_grid(inp, rates, days)
+    log_final_amount = None
+    if not np.isfinite(values[..., 0]).all():
+        log_final_amount = _log_grid(inp, rates, days)
+    return RateDurationGrid(inp.principal, inp.frequency, rates, days, values, invested, log_final_amount)
@@ -0,0 +1,94 @@
+import math
+from dataclasses import replace
+
+import pytest
+
+import engine
+import solver
+
+
+def final_amount(inp):
+    return engine.run(inp).final_amount
+
+
+@pytest.mark.parametrize("frequency", list(engine.FREQ_TO_DAYS))
+def test_principal_closed_form(frequency):
+    inp = engine.make_input(1, 5, frequency, 10, "年")
+    solved = solver.solve(inp, 1e6, "principal")
+    assert final_amount(solved) == pytest.approx(1e6, rel=1e-12)
+
+
+@pytest.mark.parametrize("frequency", list(engine.FREQ_TO_DAYS))
+def test_rate_closed_form(frequency):
+    inp = engine.make_input(1000, 1, frequency, 10, "年")
+    solved = solver.solve(inp, 1e6, "rate")
+    assert final_amount(solved) == pytest.approx(1e6, rel=1e-12)
+
+
+def test_duration_is_first_day_reaching_target():
+    inp = engine.make_input(1000, 10, "按年", 1, "年")
+    solved = solver.solve(inp, 2000, "duration")
+    day = int(solved.total_days)
+    projection = engine.project(1000, 0.1, 365.0, day)
+    assert projection.amount_at(day) >= 2000 > projection.amount_at(day - 1)
+
+
+def test_principal_with_contribution():
+    inp = engine.make_input(1, 5, "按年", 20, "年", contribution_amount=100, contribution_unit="月")
+    solved = solver.solve(inp, 1e5, "principal")
+    assert final_amount(solved) == pytest.approx(1e5, rel=1e-9)
+
+
+def test_principal_when_contributions_exceed_target():
+    inp = engine.make_input(1, 5, "按年", 20, "年", contribution_amount=1000, contribution_unit="月")
+    with pytest.raises(engine.InputError):
+        solver.solve(inp, 1e5, "principal")
+
+
+@pytest.mark.parametrize("step_up", [0, 3])
+def test_rate_with_contribution(step_up):
+    inp = engine.make_input(1000, 1, "按月", 30, "年", contribution_amount=100, contribution_unit="月",
+                            step_up_percent=step_up)
+    solved = solver.solve(inp, 1e6, "rate")
+    assert final_amount(solved) == pytest.approx(1e6, rel=1e-9)
+
+
+def test_duration_with_contribution():
+    inp = engine.make_input(1000, 0.5, "按月", 1, "年", contribution_amount=100, contribution_unit="月")
+    solved = solver.solve(inp, 50000, "duration")
+    day = int(solved.total_days)
+    projection = engine.run(replace(inp, total_days=float(day)))
+    assert projection.amount_at(day) >= 50000 > projection.amount_at(day - 1)
+
+
+def test_principal_with_overflowing_growth():
+    # 增长倍数超出浮点范围时在对数空间求解, 不抛出 OverflowError
+    inp = engine.make_input(1, 5, "按日", 40, "年")
+    solved = solver.solve(inp, 1e300, "principal")
+    expected = math.exp(math.log(1e300) - int(inp.total_days) * math.log1p(0.05))
+    assert solved.principal == pytest.approx(expected, rel=1e-9)
+
+
+def test_principal_below_smallest_float():
+    inp = engine.make_input(1, 5, "按日", 50, "年")
+    with pytest.raises(engine.InputError):
+        solver.solve(inp, 1e6, "principal")
+
+
+def test_rate_that_overflows():
+    inp = engine.make_input(1000, 10, "按年", 1, "日")
+    with pytest.raises(engine.InputError):
+        solver.solve(inp, 1e6, "rate")
+
+
+def test_rate_below_principal():
+    inp = engine.make_input(1000, 10, "按年", 1, "年")
+    with pytest.raises(engine.InputError):
+        solver.solve(inp, 500, "rate")
+
+
+@pytest.mark.parametrize("target", [0, -1, "inf", "nan"])
+def test_invalid_target(target):
+    inp = engine.make_input(1000, 10, "按年", 1, "年")
+    with pytest.raises(engine.InputError):
+        solver.solve(inp, target, "rate")